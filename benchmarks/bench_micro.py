@@ -0,0 +1,331 @@
+"""Micro-benchmarks of per-item serialization and per-request dependency
+resolution, checked against a stored baseline.
+
+Each case runs over 1, 100 and 10,000 stub items (Beanie documents built
+with `model_construct`, no database) and reports the median time per
+call and the memory allocated per call (tracemalloc peak over the batch).
+
+Every pass over a case is divided by the time of a fixed pure-Python
+calibration loop run right before it, so both see the machine at the
+same speed, and cases are compared by the median of these ratios: a
+baseline recorded on one machine stays comparable on another, and a few
+passes slowed by other processes move the median little. Each case is
+timed --repeat times and then, until its timings add up to
+MIN_CASE_SECONDS, up to MAX_REPEAT_FACTOR times as often: the fastest
+cases, where a little scheduling noise is a large share of the time,
+get the most. The run exits with status 1 when a case, timed a second
+time if needed, is slower than its baseline by more than both
+--threshold and --noise-floor-us, or allocates more than --threshold
+extra.
+
+Run with: python -m benchmarks.bench_micro
+          python -m benchmarks.bench_micro --save-baseline
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+from bson import ObjectId
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmarks")
+os.environ.setdefault("TENANT_TOKEN_SECRET", "benchmark-secret")
+
+from starlette.requests import Request  # noqa: E402
+
+from src.auth.services import token_svc  # noqa: E402
+from src.core.config import Config, QuotaTier  # noqa: E402
+from src.db.tenancy import TenantNamespace, namespaces  # noqa: E402
+from src.dependencies.quota import quota_manager  # noqa: E402
+from src.dependencies.rbac import require_role  # noqa: E402
+from src.dependencies.tenant import TenantContext, tenant_cache  # noqa: E402
+from src.notes.models import Note  # noqa: E402
+from src.notes.schemas import NoteReadSchema  # noqa: E402
+from src.organizations.models import Organization  # noqa: E402
+from src.organizations.schemas import OrganizationReadSchema  # noqa: E402
+from src.users.models import User  # noqa: E402
+from src.users.schemas import UserReadSchema  # noqa: E402
+
+BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+SIZES = (1, 100, 10_000)
+# Distinct tenants cycled through by the dependency cases.
+TENANTS = 100
+NOW = datetime.now(timezone.utc)
+# Time each case for at least this long, with at most this many times
+# --repeat passes.
+MIN_CASE_SECONDS = 1.0
+MAX_REPEAT_FACTOR = 10
+
+
+def make_org(i: int) -> Organization:
+    return Organization.model_construct(
+        id=ObjectId(), name=f"Org {i}", description="Benchmark organization",
+        tier="bench", created_at=NOW)
+
+
+def make_user(i: int, org: Organization) -> User:
+    return User.model_construct(
+        id=ObjectId(), email=f"user{i}@example.com", full_name=f"User {i}",
+        role="writer", org=org, created_at=NOW)
+
+
+def make_note(i: int, org: Organization, author: User) -> Note:
+    return Note.model_construct(
+        id=ObjectId(), title=f"Note {i}",
+        content="Lorem ipsum dolor sit amet. " * 20,
+        org=org, author=author, created_at=NOW)
+
+
+def make_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/notes/",
+                    "headers": [], "query_string": b""})
+
+
+def prepare_tenants() -> list[dict]:
+    """Stub tenants, cached as a resolved header context would be, with
+    an unthrottled quota tier so `require_role` never raises."""
+    Config.QUOTA_TIERS["bench"] = QuotaTier(
+        read_per_second=1e9, read_burst=10**9,
+        write_per_second=1e9, write_burst=10**9)
+    Config.QUOTA_SYNC_SECONDS = float("inf")
+    tenant_cache.ttl = float("inf")
+    namespaces.ttl = float("inf")
+
+    tenants = []
+    for i in range(TENANTS):
+        org = make_org(i)
+        user = make_user(i, org)
+        ctx = {"org": org, "user": user, "role": user.role}
+        tenant_cache.set((str(org.id), str(user.id)), ctx)
+        namespaces.add(TenantNamespace(org.id, "shared"))
+        quota_manager.assign(str(org.id), "bench")
+        tenants.append({
+            "ctx": ctx,
+            "headers": {"x_org_id": str(org.id), "x_user_id": str(user.id)},
+            "authorization": "Bearer " + token_svc.issue_token(
+                org, user, user.role).access_token,
+        })
+    return tenants
+
+
+def cycle(tenants: list[dict], n: int) -> list[dict]:
+    return [tenants[i % len(tenants)] for i in range(n)]
+
+
+def notes_case(n: int):
+    org = make_org(0)
+    authors = [make_user(i, org) for i in range(20)]
+    docs = [make_note(i, org, authors[i % 20]) for i in range(n)]
+
+    async def run():
+        return [await NoteReadSchema.from_mongo(doc) for doc in docs]
+    return run
+
+
+def users_case(n: int):
+    org = make_org(0)
+    docs = [make_user(i, org) for i in range(n)]
+
+    async def run():
+        return [await UserReadSchema.from_mongo(doc) for doc in docs]
+    return run
+
+
+def orgs_case(n: int):
+    docs = [make_org(i) for i in range(n)]
+
+    async def run():
+        return [OrganizationReadSchema.from_mongo(doc) for doc in docs]
+    return run
+
+
+def context_headers_case(tenant_ctx: TenantContext, tenants: list[dict], n: int):
+    calls = cycle(tenants, n)
+
+    async def run():
+        return [await tenant_ctx(**t["headers"], authorization=None)
+                for t in calls]
+    return run
+
+
+def context_token_case(tenant_ctx: TenantContext, tenants: list[dict], n: int):
+    calls = cycle(tenants, n)
+
+    async def run():
+        return [await tenant_ctx(x_org_id=None, x_user_id=None,
+                                 authorization=t["authorization"])
+                for t in calls]
+    return run
+
+
+def role_case(role_checker, request: Request, tenants: list[dict], n: int):
+    calls = cycle(tenants, n)
+
+    async def run():
+        return [await role_checker(request, t["ctx"]) for t in calls]
+    return run
+
+
+def build_cases(tenants: list[dict]) -> dict:
+    """Map each case name to a factory: size -> async callable running
+    `size` calls over prebuilt inputs."""
+    tenant_ctx = TenantContext()
+    return {
+        "NoteReadSchema.from_mongo": notes_case,
+        "UserReadSchema.from_mongo": users_case,
+        "OrganizationReadSchema.from_mongo": orgs_case,
+        "TenantContext.__call__[headers]": partial(
+            context_headers_case, tenant_ctx, tenants),
+        "TenantContext.__call__[token]": partial(
+            context_token_case, tenant_ctx, tenants),
+        "require_role": partial(
+            role_case, require_role("reader", "writer", "admin"),
+            make_request(), tenants),
+    }
+
+
+def calibration_workload():
+    """A fixed pure-Python workload timed alongside every case."""
+    data = {}
+    for i in range(20_000):
+        data[str(i)] = [i, i * 2, {"k": i}]
+    return sorted(data, key=len)
+
+
+async def median_times(runs: list, repeat: int) -> tuple[float, float]:
+    """Median time, in seconds, of the passes over `runs`, and median of
+    each pass's time divided by that of the calibration workload run
+    just before it."""
+    # As timeit does, keep garbage collection out of the timings.
+    gc.collect()
+    gc.disable()
+    try:
+        times, ratios = [], []
+        while len(times) < repeat or (
+                sum(times) < MIN_CASE_SECONDS
+                and len(times) < repeat * MAX_REPEAT_FACTOR):
+            start = time.perf_counter()
+            calibration_workload()
+            calibration = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for run in runs:
+                await run()
+            took = time.perf_counter() - start
+            times.append(took)
+            ratios.append(took / calibration)
+    finally:
+        gc.enable()
+    return statistics.median(times), statistics.median(ratios)
+
+
+async def measure(factory, size: int, repeat: int) -> dict:
+    # Small batches are repeated so each timing covers enough calls.
+    loops = max(1, 1000 // size)
+    runs = [factory(size) for _ in range(loops)]
+    took, ratio = await median_times(runs, repeat)
+
+    run = factory(size)
+    tracemalloc.start()
+    try:
+        await run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    calls = size * loops
+    return {"us_per_call": took / calls * 1e6,
+            # Per call, in millionths of the calibration workload.
+            "calibrated_per_call": ratio / calls * 1e6,
+            "bytes_per_call": peak / size}
+
+
+def regressions(results: dict, baseline: dict, threshold: float,
+                noise_floor_us: float) -> list[tuple[str, str]]:
+    """(case, message) for every case over its limits."""
+    failed = []
+    for key, current in results.items():
+        expected = baseline["results"].get(key)
+        if expected is None:
+            continue
+        ratio = current["calibrated_per_call"] / expected["calibrated_per_call"]
+        # The slowdown in microseconds at the machine's current speed.
+        extra_us = current["us_per_call"] * (1 - 1 / ratio)
+        limit_bytes = expected["bytes_per_call"] * (1 + threshold)
+        if ratio > 1 + threshold and extra_us > noise_floor_us:
+            failed.append((key, f"{ratio - 1:.0%} slower than the baseline "
+                                f"({extra_us:.2f}us/call)"))
+        if current["bytes_per_call"] > limit_bytes:
+            failed.append((key, f"{current['bytes_per_call']:.0f}B/call "
+                                f"> {limit_bytes:.0f}B allowed"))
+    return failed
+
+
+async def retime(cases: dict, results: dict, keys: set[str], repeat: int):
+    """Time the `keys` cases again and keep their better run, so a slow
+    moment of the machine is not taken for a regression."""
+    for key in keys:
+        name, size = key.rsplit("@", 1)
+        retry = await measure(cases[name], int(size), repeat)
+        results[key] = min(results[key], retry,
+                           key=lambda r: r["calibrated_per_call"])
+
+
+async def main(repeat: int, threshold: float, noise_floor_us: float,
+               save: bool, baseline_path: Path) -> int:
+    cases = build_cases(prepare_tenants())
+
+    results = {}
+    print(f"median of {repeat} to {repeat * MAX_REPEAT_FACTOR} runs "
+          f"(at least {MIN_CASE_SECONDS:g}s per case)")
+    print(f"{'case':<38}{'items':>7}{'us/call':>10}{'bytes/call':>12}")
+    for name, factory in cases.items():
+        for size in SIZES:
+            result = await measure(factory, size, repeat)
+            results[f"{name}@{size}"] = result
+            print(f"{name:<38}{size:>7}{result['us_per_call']:>10.2f}"
+                  f"{result['bytes_per_call']:>12.0f}")
+
+    if save:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(
+            json.dumps({"results": results}, indent=2) + "\n")
+        print(f"baseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    failed = regressions(results, baseline, threshold, noise_floor_us)
+    if failed:
+        await retime(cases, results, {key for key, _ in failed}, repeat)
+        failed = regressions(results, baseline, threshold, noise_floor_us)
+    for key, line in failed:
+        print(f"REGRESSION {key}: {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown/extra allocation (0.25 = 25%%)")
+    parser.add_argument("--noise-floor-us", type=float, default=2.0,
+                        help="slowdowns up to this many (calibrated) "
+                             "microseconds per call never fail")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.repeat, args.threshold, args.noise_floor_us,
+                              args.save_baseline, args.baseline)))
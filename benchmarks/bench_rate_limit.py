@@ -0,0 +1,134 @@
+"""Per-request overhead of the rate limiter for each key function and
+storage backend.
+
+Each case drives a one-route app through httpx.ASGITransport and reports
+the mean time per request minus the same app without a limiter: once
+with one request at a time, and once with --concurrency clients against
+a route that awaits --io-ms of simulated database time. limits' storage
+clients are synchronous, so a shared store's round trips block the event
+loop and add up under concurrency instead of overlapping with the I/O.
+
+Run with: python -m benchmarks.bench_rate_limit --requests 2000
+          python -m benchmarks.bench_rate_limit --storage mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmarks")
+os.environ.setdefault("TENANT_TOKEN_SECRET", "benchmark-secret")
+
+from bson import ObjectId  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from slowapi import Limiter  # noqa: E402
+from slowapi.middleware import SlowAPIMiddleware  # noqa: E402
+
+from src.auth.services import token_svc  # noqa: E402
+from src.middlewares.rate_limit import KEY_FUNCS, storage_options  # noqa: E402
+from src.organizations.models import Organization  # noqa: E402
+from src.users.models import User  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def build_app(limiter: Limiter | None, io_seconds: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    async def ping(request: Request):
+        if io_seconds:
+            await asyncio.sleep(io_seconds)
+        return {"ok": True}
+
+    if limiter is not None:
+        app.state.limiter = limiter
+        app.add_middleware(SlowAPIMiddleware)
+        ping = limiter.limit("1000000/minute")(ping)
+
+    app.add_api_route("/ping", ping)
+    return app
+
+
+def make_headers() -> dict[str, dict]:
+    org = Organization.model_construct(id=ObjectId(), name="Bench Org")
+    user = User.model_construct(id=ObjectId(), email="bench@example.com",
+                                full_name="Bench", role="reader", org=org)
+    token = token_svc.issue_token(org, user, "reader").access_token
+    return {
+        "headers": {"X-Org-ID": str(org.id), "X-User-ID": str(user.id)},
+        "bearer": {"Authorization": f"Bearer {token}"},
+    }
+
+
+async def time_requests(app: FastAPI, headers: dict, requests: int,
+                        concurrency: int = 1) -> float:
+    """Wall time per request, with `concurrency` clients sharing them."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport,
+                           base_url="http://testserver") as client:
+        async def run(n: int):
+            for _ in range(n):
+                await client.get("/ping", headers=headers)
+
+        await run(50)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[run(requests // concurrency)
+                               for _ in range(concurrency)])
+        return (time.perf_counter() - start) / (
+            requests // concurrency * concurrency)
+
+
+async def best_of(repeat: int, app: FastAPI, headers: dict,
+                  requests: int, concurrency: int = 1) -> float:
+    return min([await time_requests(app, headers, requests, concurrency)
+                for _ in range(repeat)])
+
+
+async def main(requests: int, repeat: int, storages: list[str],
+               concurrency: int, io_seconds: float) -> None:
+    identities = make_headers()
+    baseline = await best_of(repeat, build_app(None), identities["headers"],
+                             requests)
+    concurrent_baseline = await best_of(
+        repeat, build_app(None, io_seconds), identities["headers"], requests,
+        concurrency)
+
+    print(f"{requests} requests, baseline {baseline * 1e6:.1f}us/request "
+          f"without a limiter ({concurrent_baseline * 1e6:.1f}us/request with "
+          f"{concurrency} clients and {io_seconds * 1e3:g}ms of I/O each)")
+    print(f"{'storage':<32}{'key':<6}{'auth':<9}"
+          f"{'overhead us/request':>20}{f'x{concurrency} clients':>16}")
+    for storage in storages:
+        for key, key_func in KEY_FUNCS.items():
+            for auth, headers in identities.items():
+                limiter = Limiter(key_func=key_func, storage_uri=storage,
+                                  storage_options=storage_options(storage))
+                elapsed = await best_of(repeat, build_app(limiter), headers,
+                                        requests)
+                concurrent = await best_of(
+                    repeat, build_app(limiter, io_seconds), headers, requests,
+                    concurrency)
+                overhead = (elapsed - baseline) * 1e6
+                contended = (concurrent - concurrent_baseline) * 1e6
+                print(f"{storage:<32}{key:<6}{auth:<9}"
+                      f"{overhead:>20.1f}{contended:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--io-ms", type=float, default=1.0,
+                        help="simulated database time of the concurrent route")
+    parser.add_argument("--storage", action="append",
+                        help="limits storage URI; repeatable "
+                             "(default: memory://)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.repeat,
+                     args.storage or ["memory://"], args.concurrency,
+                     args.io_ms / 1e3))
@@ -0,0 +1,166 @@
+"""Per-item cost of serializing list responses, before and after the
+raw-document fast path.
+
+"before" replays the previous pipeline: Beanie document ->
+`from_mongo` (model_dump, dict copy, validation) -> FastAPI response_model
+validation -> JSONResponse rendering. "after" builds schemas from raw
+Mongo dicts with `model_construct` and dumps them with the precompiled
+list `TypeAdapter`.
+
+Run with: python -m benchmarks.bench_serialization --items 1000
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+from bson import DBRef, ObjectId
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmarks")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from src.notes.models import Note  # noqa: E402
+from src.notes.schemas import NoteReadSchema, note_list_adapter  # noqa: E402
+from src.organizations.models import Organization  # noqa: E402
+from src.organizations.schemas import (  # noqa: E402
+    OrganizationMiniSchema, OrganizationReadSchema, org_list_adapter
+)
+from src.users.models import User  # noqa: E402
+from src.users.schemas import (  # noqa: E402
+    UserMiniSchema, UserReadSchema, user_list_adapter
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+def make_org_doc(i: int) -> dict:
+    return {"_id": ObjectId(), "name": f"Org {i}",
+            "description": "Benchmark organization", "created_at": NOW}
+
+
+def make_user_doc(i: int, org: dict) -> dict:
+    return {"_id": ObjectId(), "email": f"user{i}@example.com",
+            "full_name": f"User {i}", "role": "writer", "created_at": NOW,
+            "org": DBRef("organizations", org["_id"])}
+
+
+def make_note_doc(i: int, org: dict, author: dict) -> dict:
+    return {"_id": ObjectId(), "title": f"Note {i}",
+            "content": "Lorem ipsum dolor sit amet. " * 20, "created_at": NOW,
+            "org": DBRef("organizations", org["_id"]),
+            "author": DBRef("users", author["_id"])}
+
+
+def as_document(model, doc: dict, **links):
+    data = {k: v for k, v in doc.items() if k not in ("_id", *links)}
+    return model.model_construct(id=doc["_id"], **data, **links)
+
+
+async def render_via_fastapi(response_model, items) -> bytes:
+    field = create_model_field("Response", response_model, mode="serialization")
+    content = await serialize_response(field=field, response_content=items)
+    return JSONResponse(content).body
+
+
+async def notes_before(org_doc, author_docs, notes):
+    org = as_document(Organization, org_doc)
+    authors = {a["_id"]: as_document(User, a, org=org) for a in author_docs}
+    docs = [as_document(Note, n, org=org, author=authors[n["author"].id])
+            for n in notes]
+
+    start = time.perf_counter()
+    items = [await NoteReadSchema.from_mongo(doc) for doc in docs]
+    await render_via_fastapi(list[NoteReadSchema], items)
+    return time.perf_counter() - start
+
+
+async def notes_after(org_doc, author_docs, notes):
+    org = as_document(Organization, org_doc)
+    authors = {a["_id"]: as_document(User, a, org=org) for a in author_docs}
+
+    start = time.perf_counter()
+    org_mini = OrganizationMiniSchema.from_document(org)
+    author_minis = {i: UserMiniSchema.from_document(a) for i, a in authors.items()}
+    items = [NoteReadSchema.from_raw(n, org_mini, author_minis[n["author"].id])
+             for n in notes]
+    note_list_adapter.dump_json(items, by_alias=True)
+    return time.perf_counter() - start
+
+
+async def users_before(org_doc, users):
+    org = as_document(Organization, org_doc)
+    docs = [as_document(User, u, org=org) for u in users]
+
+    start = time.perf_counter()
+    items = [await UserReadSchema.from_mongo(doc) for doc in docs]
+    await render_via_fastapi(list[UserReadSchema], items)
+    return time.perf_counter() - start
+
+
+async def users_after(org_doc, users):
+    org = as_document(Organization, org_doc)
+
+    start = time.perf_counter()
+    org_mini = OrganizationMiniSchema.from_document(org)
+    items = [UserReadSchema.from_raw(u, org_mini) for u in users]
+    user_list_adapter.dump_json(items, by_alias=True)
+    return time.perf_counter() - start
+
+
+async def orgs_before(orgs):
+    docs = [as_document(Organization, o) for o in orgs]
+
+    start = time.perf_counter()
+    items = [OrganizationReadSchema.from_mongo(doc) for doc in docs]
+    await render_via_fastapi(list[OrganizationReadSchema], items)
+    return time.perf_counter() - start
+
+
+async def orgs_after(orgs):
+    start = time.perf_counter()
+    items = [OrganizationReadSchema.from_raw(o) for o in orgs]
+    org_list_adapter.dump_json(items, by_alias=True)
+    return time.perf_counter() - start
+
+
+async def best_of(repeat: int, bench, *args) -> float:
+    return min([await bench(*args) for _ in range(repeat)])
+
+
+async def main(items: int, authors: int, repeat: int) -> None:
+    org = make_org_doc(0)
+    author_docs = [make_user_doc(i, org) for i in range(authors)]
+    notes = [make_note_doc(i, org, author_docs[i % authors])
+             for i in range(items)]
+    users = [make_user_doc(i, org) for i in range(items)]
+    orgs = [make_org_doc(i) for i in range(items)]
+
+    cases = [
+        ("GET /notes/", (notes_before, org, author_docs, notes),
+         (notes_after, org, author_docs, notes)),
+        ("GET /organizations/{id}/users/", (users_before, org, users),
+         (users_after, org, users)),
+        ("GET /organizations/", (orgs_before, orgs), (orgs_after, orgs)),
+    ]
+
+    print(f"{items} items, best of {repeat} runs, microseconds per item")
+    print(f"{'endpoint':<34}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name, before, after in cases:
+        t_before = await best_of(repeat, *before) / items * 1e6
+        t_after = await best_of(repeat, *after) / items * 1e6
+        print(f"{name:<34}{t_before:>10.2f}{t_after:>10.2f}"
+              f"{t_before / t_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--authors", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.authors, args.repeat))
@@ -0,0 +1,390 @@
+"""Load test of the full application: throughput and latency percentiles
+per scenario, as JSON, so runs on different commits can be compared.
+
+The app comes from `create_app()` and runs its real lifespan, middleware
+and routes, driven in-process through httpx.ASGITransport or over a real
+socket with uvicorn. Tenants are seeded directly through Beanie before
+the timed runs into a dedicated database that is dropped afterwards.
+
+MongoDB is either the server at --mongo-uri or a throwaway `mongod` from
+PATH started on a temporary directory (--spawn-mongod).
+
+Run with: python -m benchmarks.load_test --spawn-mongod --output before.json
+          READ_ROUTING_PREFERENCE=secondaryPreferred python -m benchmarks.load_test \\
+              --spawn-mongod --replica-set rs0
+          python -m benchmarks.load_test --mongo-uri mongodb://localhost:27017 \\
+              --transport uvicorn --scenario list --scenario mixed
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = ("list", "get", "create", "delete", "mixed")
+
+# Operation weights of the mixed scenario.
+MIXED_WEIGHTS = {"list": 40, "get": 35, "create": 20, "delete": 5}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError):
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        time.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port} after {timeout}s")
+
+
+def initiate_replica_set(port: int, name: str, timeout: float) -> None:
+    """Turn a fresh mongod into a one-member replica set and wait until it
+    is primary, so sessions, cluster times and read preferences behave
+    as in production."""
+    from pymongo import MongoClient
+
+    client = MongoClient(f"mongodb://127.0.0.1:{port}/?directConnection=true")
+    try:
+        client.admin.command("replSetInitiate", {
+            "_id": name, "members": [{"_id": 0, "host": f"127.0.0.1:{port}"}]})
+        deadline = time.monotonic() + timeout
+        while not client.admin.command("hello").get("isWritablePrimary"):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"replica set {name} has no primary")
+            time.sleep(0.2)
+    finally:
+        client.close()
+
+
+@contextlib.contextmanager
+def spawn_mongod(replica_set: str | None = None):
+    """Run a throwaway mongod on a free port and temporary data directory,
+    optionally as a single-member replica set."""
+    mongod = shutil.which("mongod")
+    if mongod is None:
+        sys.exit("--spawn-mongod needs a `mongod` binary on PATH")
+
+    port = free_port()
+    args = ["--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"]
+    if replica_set:
+        args += ["--replSet", replica_set]
+
+    with tempfile.TemporaryDirectory(prefix="notes-load-test-") as dbpath:
+        process = subprocess.Popen([mongod, "--dbpath", dbpath, *args],
+                                   stdout=subprocess.DEVNULL)
+        try:
+            wait_for_port(port, timeout=30)
+            if replica_set:
+                initiate_replica_set(port, replica_set, timeout=30)
+                yield f"mongodb://127.0.0.1:{port}/?replicaSet={replica_set}"
+            else:
+                yield f"mongodb://127.0.0.1:{port}"
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+class Tenant:
+    """Seeded organization with its users by role and readable note ids."""
+
+    def __init__(self, org, users, note_ids):
+        self.org_id = str(org.id)
+        self.org = org
+        self.users = users
+        self.note_ids = note_ids
+
+    def headers(self, role: str) -> dict:
+        user = self.users[role]
+        return {"X-Org-ID": self.org_id, "X-User-ID": str(user.id)}
+
+
+async def drop_databases(mongo, db_name: str) -> None:
+    """Drop the benchmark database and those of organizations seeded with
+    TENANT_ISOLATION=database."""
+    for name in await mongo.list_database_names():
+        if name == db_name or name.startswith(f"{db_name}_"):
+            await mongo.drop_database(name)
+
+
+async def seed(orgs: int, users: int, notes: int) -> list["Tenant"]:
+    from beanie import PydanticObjectId
+
+    from src.db.tenancy import namespaces, tenant_collection, to_db
+    from src.notes.models import Note
+    from src.notes.services import note_svc
+    from src.organizations.models import Organization
+    from src.users.models import User
+
+    roles = ("admin", "writer", "reader")
+    tenants = []
+    for i in range(orgs):
+        org = Organization(name=f"Load Org {i}")
+        await org.insert()
+        # Into the organization's namespace, as the API writes them under
+        # TENANT_ISOLATION=database|collection.
+        await namespaces.bind(org.id)
+
+        members = [
+            User(id=PydanticObjectId(),
+                 email=f"user-{j}@org-{i}.example.com", full_name=f"User {j}",
+                 role=roles[j % len(roles)], org=org)
+            for j in range(max(users, len(roles)))
+        ]
+        await tenant_collection(User, org.id).insert_many(
+            [to_db(member) for member in members])
+
+        docs = [
+            Note(id=PydanticObjectId(), title=f"Note {k}",
+                 content=f"Seeded note {k} of org {i}.",
+                 org=org, author=members[k % len(members)],
+                 **note_svc.snapshots(org, members[k % len(members)]))
+            for k in range(notes)
+        ]
+        if docs:
+            await tenant_collection(Note, org.id).insert_many(
+                [to_db(doc) for doc in docs])
+
+        tenants.append(Tenant(org, {member.role: member for member in members},
+                              [str(doc.id) for doc in docs]))
+    return tenants
+
+
+async def seed_deletable(tenant: Tenant, count: int) -> list[str]:
+    """Notes only the delete operations touch, so reads never 404."""
+    from beanie import PydanticObjectId
+
+    from src.db.tenancy import namespaces, tenant_collection, to_db
+    from src.notes.models import Note
+    from src.notes.services import note_svc
+
+    docs = [Note(id=PydanticObjectId(), title=f"Deletable {k}",
+                 content="Seeded for deletion.",
+                 org=tenant.org, author=tenant.users["writer"],
+                 **note_svc.snapshots(tenant.org, tenant.users["writer"]))
+            for k in range(count)]
+    if docs:
+        await namespaces.bind(tenant.org.id)
+        await tenant_collection(Note, tenant.org.id).insert_many(
+            [to_db(doc) for doc in docs])
+    return [str(doc.id) for doc in docs]
+
+
+async def plan(scenario: str, requests: int, tenants: list[Tenant],
+               rng: random.Random) -> list[tuple]:
+    """Build the (method, url, headers, json) operations of a scenario up
+    front, from a seeded RNG, so every run replays the same sequence."""
+    kinds = (rng.choices(list(MIXED_WEIGHTS), list(MIXED_WEIGHTS.values()),
+                         k=requests)
+             if scenario == "mixed" else [scenario] * requests)
+    targets = [rng.choice(tenants) for _ in kinds]
+
+    deletable = {}
+    for tenant in tenants:
+        count = sum(1 for kind, target in zip(kinds, targets)
+                    if kind == "delete" and target is tenant)
+        deletable[tenant.org_id] = await seed_deletable(tenant, count)
+
+    operations = []
+    for i, (kind, tenant) in enumerate(zip(kinds, targets)):
+        if kind == "list":
+            operations.append(("GET", "/notes/?limit=50",
+                               tenant.headers("reader"), None))
+        elif kind == "get":
+            note_id = rng.choice(tenant.note_ids)
+            operations.append(("GET", f"/notes/{note_id}",
+                               tenant.headers("reader"), None))
+        elif kind == "create":
+            operations.append(("POST", "/notes/", tenant.headers("writer"),
+                               {"title": f"Load {i}",
+                                "content": "Created by the load test."}))
+        else:
+            note_id = deletable[tenant.org_id].pop()
+            operations.append(("DELETE", f"/notes/{note_id}",
+                               tenant.headers("admin"), None))
+    return operations
+
+
+async def run_scenario(client, operations: list[tuple],
+                       concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    pending = iter(operations)
+
+    async def worker():
+        nonlocal errors
+        for method, url, headers, body in pending:
+            start = time.perf_counter()
+            response = await client.request(method, url, headers=headers,
+                                            json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def percentiles(latencies: list[float]) -> dict:
+    ms = sorted(latency * 1000 for latency in latencies)
+    cuts = statistics.quantiles(ms, n=100, method="inclusive")
+    return {
+        "mean": round(statistics.fmean(ms), 3),
+        "p50": round(cuts[49], 3),
+        "p90": round(cuts[89], 3),
+        "p99": round(cuts[98], 3),
+        "max": round(ms[-1], 3),
+    }
+
+
+@contextlib.asynccontextmanager
+async def serve(app, transport: str):
+    """Yield an httpx client talking to `app` with its lifespan running."""
+    from httpx import ASGITransport, AsyncClient
+
+    if transport == "asgi":
+        async with app.router.lifespan_context(app):
+            async with AsyncClient(transport=ASGITransport(app=app),
+                                   base_url="http://testserver") as client:
+                yield client
+        return
+
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port,
+                                           log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await task
+
+
+def git_commit() -> str | None:
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True).strip()
+    return None
+
+
+async def run(args, mongo_uri: str) -> dict:
+    os.environ["MONGO_URI"] = mongo_uri
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("LOG_SUCCESS_SAMPLE_RATE", "0")
+    if not args.quotas:
+        os.environ["QUOTA_ENABLED"] = "false"
+
+    from src.db.migrations import sync_indexes
+    from src.main import create_app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = create_app()
+    rng = random.Random(args.seed)
+    report = {
+        "commit": git_commit(),
+        "transport": args.transport,
+        "concurrency": args.concurrency,
+        "seed": {"orgs": args.orgs, "users": args.users, "notes": args.notes},
+        "scenarios": {},
+    }
+
+    async with serve(app, args.transport) as client:
+        mongo = app.state.mongo_client
+        await drop_databases(mongo, args.db_name)
+        try:
+            # Re-create the indexes dropped with the database.
+            await sync_indexes(mongo[args.db_name])
+
+            tenants = await seed(args.orgs, args.users, args.notes)
+            for scenario in args.scenario or SCENARIOS:
+                operations = await plan(scenario, args.requests, tenants, rng)
+                await run_scenario(client, operations[:args.warmup],
+                                   args.concurrency)
+                report["scenarios"][scenario] = await run_scenario(
+                    client, operations[args.warmup:], args.concurrency)
+        finally:
+            if not args.keep:
+                await drop_databases(mongo, args.db_name)
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--mongo-uri", help="MongoDB server to run against")
+    source.add_argument("--spawn-mongod", action="store_true",
+                        help="start a throwaway mongod from PATH")
+    parser.add_argument("--replica-set", metavar="NAME",
+                        help="with --spawn-mongod, run it as a one-member "
+                             "replica set (needed for READ_ROUTING_*)")
+    parser.add_argument("--db-name", default="notes_load_test",
+                        help="database to seed; dropped before and after")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the seeded database afterwards")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"],
+                        default="asgi")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="repeatable (default: all)")
+    parser.add_argument("--orgs", type=int, default=4)
+    parser.add_argument("--users", type=int, default=10,
+                        help="users per organization")
+    parser.add_argument("--notes", type=int, default=500,
+                        help="notes per organization")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=100,
+                        help="untimed requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quotas", action="store_true",
+                        help="keep per-organization quotas enabled")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+    args.requests += args.warmup
+
+    with contextlib.ExitStack() as stack:
+        mongo_uri = (stack.enter_context(spawn_mongod(args.replica_set))
+                     if args.spawn_mongod else args.mongo_uri)
+        report = asyncio.run(run(args, mongo_uri))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Gunicorn settings, read from the working directory on start."""
+import os
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    # Drop the live gauges (http_requests_in_flight, cache_entries) of a
+    # worker that exited, or its last values would be summed forever.
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Request, status, Depends
+
+from src.auth.schemas import TenantTokenSchema
+from src.auth.services import token_svc
+from src.dependencies.tenant import TenantContext
+
+issuer_ctx = TenantContext(issuer=True)
+
+auth_router = APIRouter()
+
+
+@auth_router.post("/token", response_model=TenantTokenSchema,
+                  status_code=status.HTTP_201_CREATED)
+async def issue_token(request: Request, ctx=Depends(issuer_ctx)):
+    return token_svc.issue_token(ctx["org"], ctx["user"], ctx["role"])
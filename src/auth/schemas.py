@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class TenantTokenSchema(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+from jose import jwt, JWTError
+
+from src.core.config import Config
+from src.auth.schemas import TenantTokenSchema
+from src.organizations.models import Organization
+from src.users.models import User
+from src.middlewares.errors import InvalidTenantToken, TenantTokensDisabled
+
+
+class TokenService:
+    """Mints and verifies short-lived tenant tokens.
+
+    A token carries everything `TenantContext` needs to rebuild the
+    request context (org and user ids, role and the display fields used
+    in responses), so verifying it never touches the database.
+    """
+
+    def issue_token(self, org: Organization, user: User,
+                    role: str) -> TenantTokenSchema:
+        if not Config.TENANT_TOKEN_SECRET:
+            raise TenantTokensDisabled()
+
+        now = datetime.now(timezone.utc)
+        ttl = Config.TENANT_TOKEN_TTL_SECONDS
+        claims = {
+            "sub": str(user.id),
+            "org_id": str(org.id),
+            "role": role,
+            "email": user.email,
+            "full_name": user.full_name,
+            "org_name": org.name,
+            "org_description": org.description,
+            "iat": now,
+            "exp": now + timedelta(seconds=ttl),
+        }
+        token = jwt.encode(claims, Config.TENANT_TOKEN_SECRET,
+                           algorithm=Config.TENANT_TOKEN_ALGORITHM)
+        return TenantTokenSchema(access_token=token, expires_in=ttl)
+
+    def decode_token(self, token: str) -> dict:
+        if not Config.TENANT_TOKEN_SECRET:
+            raise InvalidTenantToken()
+
+        try:
+            return jwt.decode(token, Config.TENANT_TOKEN_SECRET,
+                              algorithms=[Config.TENANT_TOKEN_ALGORITHM])
+        except JWTError:
+            raise InvalidTenantToken()
+
+
+token_svc = TokenService()
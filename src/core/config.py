@@ -1,10 +1,143 @@
+from typing import Literal
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+ReadMode = Literal["primary", "primaryPreferred", "secondary",
+                   "secondaryPreferred", "nearest"]
+Isolation = Literal["shared", "database", "collection"]
+
+
+class QuotaTier(BaseModel):
+    """Token-bucket budgets of one organization, per second and burst."""
+    read_per_second: float
+    read_burst: int
+    write_per_second: float
+    write_burst: int
+
+
 class Settings(BaseSettings):
     MONGO_URI: str
     DB_NAME: str
 
+    # Motor client options; None keeps the driver default (or the value
+    # given in MONGO_URI). Each gunicorn worker has its own pool.
+    MONGO_MAX_POOL_SIZE: int | None = None
+    MONGO_MIN_POOL_SIZE: int | None = None
+    MONGO_MAX_IDLE_TIME_MS: int | None = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int | None = None
+    MONGO_CONNECT_TIMEOUT_MS: int | None = None
+    MONGO_SOCKET_TIMEOUT_MS: int | None = None
+    # Comma-separated, in order of preference: zstd, snappy, zlib.
+    MONGO_COMPRESSORS: str | None = None
+    MONGO_READ_PREFERENCE: ReadMode | None = None
+
+    # Read routing: when set, GET routes read with this preference inside
+    # causally consistent sessions (see X-Causal-Token); other methods use
+    # the primary. Overrides are keyed "METHOD /route/{template}".
+    READ_ROUTING_PREFERENCE: ReadMode | None = None
+    READ_ROUTING_MAX_STALENESS_SECONDS: int | None = None
+    READ_ROUTING_OVERRIDES: dict[str, ReadMode] = {}
+    # Signs X-Causal-Token; without it responses carry none and the
+    # tokens sent by clients are ignored.
+    CAUSAL_TOKEN_SECRET: str | None = None
+
+    # Skip Beanie's index checks when workers boot; indexes are then
+    # synced once per deploy with `python -m src.db.migrations sync-indexes`.
+    SKIP_INDEX_SYNC: bool = False
+    STARTUP_BUDGET_SECONDS: float = 5.0
+
+    TENANT_CACHE_MAXSIZE: int = 1024
+    TENANT_CACHE_TTL_SECONDS: float = 30.0
+
+    # Where new organizations keep their users and notes: the shared
+    # collections, a database of their own or collections of their own.
+    # Existing ones are moved with `python -m src.db.move_tenant`.
+    TENANT_ISOLATION: Isolation = "shared"
+    TENANT_NAMESPACE_CACHE_SIZE: int = 10_000
+    # How long a worker trusts the namespace it looked up for an org.
+    TENANT_NAMESPACE_TTL_SECONDS: float = 30.0
+
+    TENANT_TOKEN_SECRET: str | None = None
+    TENANT_TOKEN_ALGORITHM: str = "HS256"
+    TENANT_TOKEN_TTL_SECONDS: int = 900
+    TENANT_TOKEN_REQUIRED: bool = False
+
+    # memory:// is per worker; use mongodb://... or redis://... to share
+    # counters between gunicorn workers, at the cost of a blocking round
+    # trip per rate-limited request (the limits clients are synchronous),
+    # cut off after RATE_LIMIT_STORAGE_TIMEOUT_MS.
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STORAGE_TIMEOUT_MS: int = 200
+    RATE_LIMIT_KEY: Literal["ip", "org", "user"] = "user"
+    RATE_LIMIT_DEFAULT: str = "5/minute"
+
+    # Per-organization quotas enforced on tenant-scoped routes. Each
+    # worker gets 1/WEB_CONCURRENCY of the tier's budget.
+    QUOTA_ENABLED: bool = True
+    QUOTA_DEFAULT_TIER: str = "standard"
+    QUOTA_SYNC_SECONDS: float = 60.0
+    # Organizations whose tier and buckets a worker keeps; one idle for
+    # QUOTA_IDLE_SECONDS (longer than any bucket takes to refill) is
+    # dropped and starts again from a full bucket.
+    QUOTA_CACHE_MAXSIZE: int = 10000
+    QUOTA_IDLE_SECONDS: float = 300.0
+    QUOTA_TIERS: dict[str, QuotaTier] = {
+        "free": QuotaTier(read_per_second=5, read_burst=20,
+                          write_per_second=1, write_burst=10),
+        "standard": QuotaTier(read_per_second=20, read_burst=100,
+                              write_per_second=5, write_burst=50),
+        "enterprise": QuotaTier(read_per_second=200, read_burst=1000,
+                                write_per_second=50, write_burst=500),
+    }
+    WEB_CONCURRENCY: int = 1
+
+    LOG_LEVEL: str = "INFO"
+    # Fraction of successful (< 400) requests written to the access log;
+    # errors are always logged.
+    LOG_SUCCESS_SAMPLE_RATE: float = 1.0
+
+    # Time the MongoDB commands of every request and flag query shapes
+    # repeated this many times as suspected N+1.
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 3
+
+    # Response compression, in order of preference when the client
+    # accepts several (br and zstd need the brotli/zstandard packages).
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: list[str] = ["zstd", "br", "gzip"]
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_LEVELS: dict[str, int] = {"gzip": 6, "br": 4, "zstd": 3}
+    # Compressed bodies of these routes are kept per tenant and reused
+    # while the uncompressed body stays the same.
+    COMPRESSION_CACHED_ROUTES: list[str] = [
+        "/notes/", "/notes/search", "/organizations/",
+        "/organizations/{org_id}/users/",
+    ]
+    COMPRESSION_CACHE_MAXSIZE: int = 256
+    COMPRESSION_CACHE_TTL_SECONDS: float = 60
+
+    NOTES_PAGE_SIZE: int = 50
+    NOTES_MAX_PAGE_SIZE: int = 200
+    NOTES_EXPORT_BATCH_SIZE: int = 500
+    NOTES_BULK_MAX_ITEMS: int = 1000
+    NOTES_BULK_RATE_LIMIT: str = "10/minute"
+    # Notes updated per write when a user/org change is fanned out.
+    NOTES_SNAPSHOT_BATCH_SIZE: int = 500
+    # Group commit for POST /notes/: inserts arriving within the window
+    # (or until the batch is full) share one insert_many.
+    NOTES_WRITE_COALESCING: bool = False
+    NOTES_WRITE_BATCH_SIZE: int = 100
+    NOTES_WRITE_WINDOW_MS: float = 2.0
+
+    @field_validator("READ_ROUTING_MAX_STALENESS_SECONDS")
+    @classmethod
+    def check_max_staleness(cls, value: int | None) -> int | None:
+        # The driver rejects smaller values on the first routed read.
+        if value is not None and value < 90:
+            raise ValueError("must be at least 90 seconds")
+        return value
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore"
@@ -1,21 +1,85 @@
+import asyncio
+import logging
+import time
+
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from fastapi import FastAPI
 
 from src.core.config import Config
+from src.db.monitoring import command_monitor
 
+logger = logging.getLogger("multi-tenant-notes-api")
 
-async def init_db(app: FastAPI) -> None:
-    mongo_uri = Config.MONGO_URI
-    client = AsyncIOMotorClient(mongo_uri)
-    db = client[Config.DB_NAME]
 
+def client_options() -> dict:
+    """Motor client keyword arguments from Settings. Unset values are left
+    out so options given in MONGO_URI still apply."""
+    options = {
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": Config.MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": Config.MONGO_SOCKET_TIMEOUT_MS,
+        "compressors": Config.MONGO_COMPRESSORS,
+        "readPreference": Config.MONGO_READ_PREFERENCE,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def create_client() -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(Config.MONGO_URI,
+                              event_listeners=[command_monitor],
+                              **client_options())
+
+
+async def warm_up(client: AsyncIOMotorClient) -> None:
+    """Open `MONGO_MIN_POOL_SIZE` connections up front with concurrent
+    pings, so the first requests after a deploy do not pay for the
+    handshakes (and fail fast here if the server is unreachable)."""
+    pings = max(1, Config.MONGO_MIN_POOL_SIZE or 0)
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(pings)))
+
+
+def document_models() -> list:
     from src.organizations.models import Organization
     from src.users.models import User
     from src.notes.models import Note
 
-    docs = [Organization, User, Note]
+    return [Organization, User, Note]
+
 
-    await init_beanie(database=db, document_models=docs)
+async def init_db(app: FastAPI) -> AsyncIOMotorClient:
+    started = time.perf_counter()
+    client = create_client()
+    await warm_up(client)
+    warmed_up = time.perf_counter()
+
+    db = client[Config.DB_NAME]
+    # Index builds are checked on every boot unless they are synced once
+    # per deploy with `python -m src.db.migrations sync-indexes`.
+    await init_beanie(database=db, document_models=document_models(),
+                      skip_indexes=Config.SKIP_INDEX_SYNC)
+    finished = time.perf_counter()
+
+    report_startup(warm_up_s=warmed_up - started,
+                   init_beanie_s=finished - warmed_up,
+                   total_s=finished - started)
 
     app.state.mongo_client = client
+    return client
+
+
+def report_startup(warm_up_s: float, init_beanie_s: float, total_s: float):
+    fields = {
+        "warm_up_ms": round(warm_up_s * 1000, 1),
+        "init_beanie_ms": round(init_beanie_s * 1000, 1),
+        "total_ms": round(total_s * 1000, 1),
+        "skip_indexes": Config.SKIP_INDEX_SYNC,
+    }
+    if total_s > Config.STARTUP_BUDGET_SECONDS:
+        logger.warning("database startup over budget", extra={"fields": {
+            **fields, "budget_ms": Config.STARTUP_BUDGET_SECONDS * 1000}})
+    else:
+        logger.info("database ready", extra={"fields": fields})
@@ -0,0 +1,108 @@
+"""Database migrations.
+
+Run with: python -m src.db.migrations <name>; see MIGRATIONS for the names.
+"""
+import argparse
+import asyncio
+
+from beanie import init_beanie
+
+from src.core.config import Config
+from src.db.connection import create_client, document_models
+from src.db.tenancy import (
+    TENANT_MODELS, TenantNamespace, namespaces, tenant_collection
+)
+from src.notes.models import OrgSnapshot, AuthorSnapshot
+from src.notes.snapshots import SnapshotRefresher
+from src.organizations.models import Organization
+from src.users.models import User
+
+# Indexes from earlier schema versions that conflict with the current ones.
+LEGACY_USER_INDEXES = ["email_1"]
+
+
+async def rebuild_user_indexes(db) -> list[str]:
+    """Replace the global unique index on `email` with the per-organization
+    `(org.$id, email)` unique index declared on `User`.
+
+    Fails without dropping anything if existing users already violate the
+    new index, so duplicates can be cleaned up first.
+    """
+    collection = db[User.Settings.name]
+
+    created = await collection.create_indexes(User.Settings.indexes)
+
+    existing = await collection.index_information()
+    for name in LEGACY_USER_INDEXES:
+        if name in existing:
+            await collection.drop_index(name)
+
+    return created
+
+
+async def sync_indexes(db) -> dict[str, list[str]]:
+    """Create the indexes declared on every document model, in the shared
+    collections and in the namespace of every isolated organization. Run
+    once per deploy when workers start with SKIP_INDEX_SYNC=true."""
+    models = document_models()
+    await init_beanie(database=db, document_models=models)
+
+    indexes = {
+        model.Settings.name: sorted(
+            await db[model.Settings.name].index_information())
+        for model in models
+    }
+    isolated = db[Organization.Settings.name].find(
+        {"isolation": {"$exists": True, "$ne": "shared"}}, {"isolation": 1})
+    async for org in isolated:
+        namespace = TenantNamespace(org["_id"], org["isolation"])
+        await namespace.create_indexes(TENANT_MODELS)
+        for model in TENANT_MODELS:
+            collection = namespace.collection(model)
+            indexes[collection.full_name] = sorted(
+                await collection.index_information())
+    return indexes
+
+
+async def refresh_note_snapshots(db) -> dict[str, int]:
+    """Write current org/author snapshots into every note lacking them:
+    notes created before snapshots existed, or whose user/organization
+    was edited outside the API."""
+    await init_beanie(database=db, document_models=document_models())
+    refresher = SnapshotRefresher()
+
+    updated = {"org": 0, "author": 0}
+    async for org in Organization.find_all():
+        await namespaces.bind(org.id)
+        updated["org"] += await refresher.apply(
+            "org", org.id, org.id, OrgSnapshot.from_document(org).model_dump())
+        users = tenant_collection(User, org.id).find({"org.$id": org.id})
+        async for user in users:
+            user = User.model_validate(user)
+            updated["author"] += await refresher.apply(
+                "author", user.id, org.id,
+                AuthorSnapshot.from_document(user).model_dump())
+    return updated
+
+
+MIGRATIONS = {
+    "rebuild-user-indexes": rebuild_user_indexes,
+    "sync-indexes": sync_indexes,
+    "refresh-note-snapshots": refresh_note_snapshots,
+}
+
+
+async def run(name: str) -> None:
+    client = create_client()
+    try:
+        result = await MIGRATIONS[name](client[Config.DB_NAME])
+        print(f"{name}: {result}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a database migration.")
+    parser.add_argument("migration", choices=sorted(MIGRATIONS))
+    args = parser.parse_args()
+    asyncio.run(run(args.migration))
@@ -0,0 +1,110 @@
+from collections import Counter
+from contextvars import ContextVar
+
+from prometheus_client import Histogram
+from pymongo import monitoring
+
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds",
+    "Time MongoDB took to answer a command, as seen by the driver.",
+    ["collection", "command", "outcome"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5),
+)
+
+# Commands whose first field is not the collection name.
+COLLECTION_FIELDS = {
+    "getMore": "collection",
+}
+
+# Fields holding the query part of a command, in lookup order.
+SHAPE_FIELDS = ("filter", "query", "pipeline", "deletes", "updates")
+
+
+class RequestStats:
+    """Per-request counters filled in by the MongoDB command listener.
+
+    Once profiling is enabled, commands are also grouped by shape so
+    repeated identical queries can be spotted.
+    """
+
+    __slots__ = ("db_calls", "db_seconds", "shapes")
+
+    def __init__(self):
+        self.db_calls = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter | None = None
+
+    def enable_profiling(self):
+        if self.shapes is None:
+            self.shapes = Counter()
+
+
+# Motor runs commands on executor threads with a copy of the caller's
+# context, so the listener sees the stats object of the request that
+# issued the command.
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None)
+
+
+def command_collection(event: monitoring.CommandStartedEvent) -> str:
+    field = COLLECTION_FIELDS.get(event.command_name, event.command_name)
+    value = event.command.get(field)
+    return value if isinstance(value, str) else ""
+
+
+def value_shape(value):
+    """Replace the values of a query with their type names, keeping field
+    names and operators, so queries differing only by ids compare equal."""
+    if isinstance(value, dict):
+        return {key: value_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [value_shape(item) for item in value[:1]]
+    return type(value).__name__
+
+
+def command_shape(event: monitoring.CommandStartedEvent) -> str:
+    shape = next((value_shape(event.command[field])
+                  for field in SHAPE_FIELDS if field in event.command), None)
+    return f"{event.command_name} {command_collection(event)} {shape}"
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Count the commands sent to MongoDB on behalf of each request and
+    record their latency by collection and command name."""
+
+    def __init__(self):
+        # Succeeded/failed events do not carry the command document, so
+        # the collection is remembered from the started event.
+        self.collections: dict[tuple, str] = {}
+
+    def started(self, event):
+        self.collections[self.key(event)] = command_collection(event)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.db_calls += 1
+            if stats.shapes is not None:
+                stats.shapes[command_shape(event)] += 1
+
+    def succeeded(self, event):
+        self.observe(event, "success")
+
+    def failed(self, event):
+        self.observe(event, "failure")
+
+    def observe(self, event, outcome: str):
+        collection = self.collections.pop(self.key(event), "")
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_LATENCY.labels(
+            collection, event.command_name, outcome
+        ).observe(seconds)
+
+        stats = request_stats.get()
+        if stats is not None:
+            stats.db_seconds += seconds
+
+    @staticmethod
+    def key(event) -> tuple:
+        return event.connection_id, event.request_id
+
+
+command_monitor = CommandMonitor()
@@ -0,0 +1,153 @@
+"""Move an organization's users and notes to another namespace.
+
+Run with: python -m src.db.move_tenant <org_id> --isolation database
+
+Documents are copied in `_id` order, one batch at a time, with upserts,
+so an interrupted copy can simply be run again. The organization is
+then switched to its new isolation; once the workers' namespace lookups
+have expired (--settle-seconds), the old namespace is drained: each
+batch is inserted where missing (documents already in the new namespace
+may have changed since and are kept) and only that batch's ids are
+deleted, until nothing is left, so writes that still land in the old
+namespace are moved rather than lost. Deletes made in the old namespace
+after the first copy may be undone, so run it at a quiet time.
+"""
+import argparse
+import asyncio
+from typing import get_args
+
+from beanie import PydanticObjectId, init_beanie
+from pymongo import ASCENDING, ReplaceOne, UpdateOne
+
+from src.core.config import Config, Isolation
+from src.db.connection import create_client, document_models
+from src.db.tenancy import TENANT_MODELS, TenantNamespace
+from src.organizations.models import Organization
+
+# Added to the namespace TTL by default before draining, for requests
+# that looked the old namespace up just before it expired.
+SETTLE_MARGIN_SECONDS = 10.0
+
+
+async def copy_documents(source, target, org_id, batch_size: int) -> int:
+    copied, last_id = 0, None
+    while True:
+        query = {"org.$id": org_id}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await (source.find(query)
+                       .sort("_id", ASCENDING)
+                       .limit(batch_size)
+                       .to_list(length=None))
+        if not batch:
+            return copied
+
+        await target.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch],
+            ordered=False)
+        copied += len(batch)
+        last_id = batch[-1]["_id"]
+
+
+async def drain_documents(source, target, org_id,
+                          batch_size: int) -> tuple[int, int]:
+    """Move what is left of `org_id`'s documents from `source` to
+    `target`; returns (inserted, deleted)."""
+    inserted = deleted = 0
+    while True:
+        batch = await (source.find({"org.$id": org_id})
+                       .limit(batch_size)
+                       .to_list(length=None))
+        if not batch:
+            return inserted, deleted
+
+        ids = [doc.pop("_id") for doc in batch]
+        result = await target.bulk_write(
+            [UpdateOne({"_id": _id}, {"$setOnInsert": doc}, upsert=True)
+             for _id, doc in zip(ids, batch)],
+            ordered=False)
+        inserted += result.upserted_count
+        # Only documents known to be in `target` now; anything written
+        # since the batch was read is picked up by the next one.
+        result = await source.delete_many({"_id": {"$in": ids}})
+        deleted += result.deleted_count
+
+
+async def settle(seconds: float) -> None:
+    """Wait for the workers' lookups of the old namespace to expire."""
+    await asyncio.sleep(seconds)
+
+
+async def drop_namespace(namespace: TenantNamespace) -> None:
+    """Drop what an isolated namespace leaves behind once emptied."""
+    if namespace.isolation == "shared":
+        return
+    for model in TENANT_MODELS:
+        collection = namespace.collection(model)
+        if await collection.estimated_document_count() == 0:
+            await collection.drop()
+
+
+async def move_tenant(db, org_id: PydanticObjectId, isolation: str,
+                      batch_size: int, settle_seconds: float) -> dict:
+    await init_beanie(database=db, document_models=document_models(),
+                      skip_indexes=True)
+
+    org = await Organization.get_pymongo_collection().find_one(
+        {"_id": org_id}, {"isolation": 1})
+    if org is None:
+        raise SystemExit(f"organization {org_id} not found")
+
+    source = TenantNamespace(org_id, org.get("isolation", "shared"))
+    target = TenantNamespace(org_id, isolation)
+    if source.isolation == target.isolation:
+        return {"moved": False}
+
+    await target.create_indexes(TENANT_MODELS)
+    copied = {}
+    for model in TENANT_MODELS:
+        copied[model.Settings.name] = await copy_documents(
+            source.collection(model), target.collection(model),
+            org_id, batch_size)
+
+    await Organization.get_pymongo_collection().update_one(
+        {"_id": org_id}, {"$set": {"isolation": isolation}})
+    await settle(settle_seconds)
+
+    resynced, deleted = {}, {}
+    for model in TENANT_MODELS:
+        name = model.Settings.name
+        resynced[name], deleted[name] = await drain_documents(
+            source.collection(model), target.collection(model),
+            org_id, batch_size)
+    await drop_namespace(source)
+
+    return {"moved": True, "copied": copied, "resynced": resynced,
+            "deleted": deleted}
+
+
+async def run(args) -> None:
+    client = create_client()
+    try:
+        result = await move_tenant(client[Config.DB_NAME],
+                                   PydanticObjectId(args.org_id),
+                                   args.isolation, args.batch_size,
+                                   args.settle_seconds)
+        print(f"move-tenant {args.org_id} -> {args.isolation}: {result}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move an organization's users and notes to another namespace.")
+    parser.add_argument("org_id")
+    parser.add_argument("--isolation", choices=get_args(Isolation), required=True)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--settle-seconds", type=float,
+                        default=(Config.TENANT_NAMESPACE_TTL_SECONDS
+                                 + SETTLE_MARGIN_SECONDS),
+                        help="wait after switching, before draining the old "
+                             "namespace (default: the namespace TTL plus "
+                             f"{SETTLE_MARGIN_SECONDS:g}s)")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,145 @@
+import base64
+import hashlib
+import hmac
+from contextvars import ContextVar
+
+import bson
+from bson import Timestamp
+from bson.errors import BSONError
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred,
+)
+
+from src.core.config import Config
+from src.db.tenancy import tenant_collection
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+READ_MODES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def make_read_preference(mode: str):
+    if mode == "primary":
+        return Primary()
+    staleness = Config.READ_ROUTING_MAX_STALENESS_SECONDS
+    return READ_MODES[mode](max_staleness=staleness if staleness else -1)
+
+
+class RequestSession:
+    """The causally consistent session of one request and the read
+    preference of the route it was routed to."""
+
+    def __init__(self, scope, session):
+        self.scope = scope
+        self.session = session
+
+    def read_mode(self) -> str:
+        # Resolved on first use: the route is only known after routing.
+        route = getattr(self.scope.get("route"), "path", "")
+        method = self.scope["method"]
+        override = Config.READ_ROUTING_OVERRIDES.get(f"{method} {route}")
+        if override:
+            return override
+        if method in READ_METHODS:
+            return Config.READ_ROUTING_PREFERENCE
+        return "primary"
+
+
+request_session: ContextVar[RequestSession | None] = ContextVar(
+    "request_session", default=None)
+
+
+def session_options() -> dict:
+    """`session=` keyword for driver and Beanie calls made while serving
+    a request with read routing enabled; empty otherwise."""
+    ctx = request_session.get()
+    return {"session": ctx.session} if ctx is not None else {}
+
+
+def read_collection(model, org_id=None):
+    """The model's collection (the tenant's, given `org_id`), with the
+    read preference of the current route when read routing is enabled."""
+    collection = (tenant_collection(model, org_id) if org_id is not None
+                  else model.get_pymongo_collection())
+    ctx = request_session.get()
+    if ctx is None:
+        return collection
+    return collection.with_options(
+        read_preference=make_read_preference(ctx.read_mode()))
+
+
+class ClusterClock:
+    """The latest cluster time this worker's sessions have seen, which a
+    causal token's operation time may not exceed."""
+
+    __slots__ = ("latest",)
+
+    def __init__(self):
+        self.latest: Timestamp | None = None
+
+    def observe(self, session) -> None:
+        cluster_time = (session.cluster_time or {}).get("clusterTime")
+        if cluster_time is not None and (self.latest is None
+                                         or cluster_time > self.latest):
+            self.latest = cluster_time
+
+    def clamp(self, operation_time: Timestamp) -> Timestamp:
+        if self.latest is not None and operation_time > self.latest:
+            return self.latest
+        return operation_time
+
+
+cluster_clock = ClusterClock()
+
+
+def b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def sign(raw: bytes) -> bytes:
+    return hmac.new(Config.CAUSAL_TOKEN_SECRET.encode(), raw,
+                    hashlib.sha256).digest()
+
+
+def encode_causal_token(session) -> str | None:
+    """Serialize what a later request needs to read this request's
+    writes: the session's operation time, signed with
+    CAUSAL_TOKEN_SECRET. None without a secret or an operation time."""
+    cluster_clock.observe(session)
+    if not Config.CAUSAL_TOKEN_SECRET or session.operation_time is None:
+        return None
+    raw = bson.encode({"operationTime": session.operation_time})
+    return f"{b64encode(raw)}.{b64encode(sign(raw))}"
+
+
+def apply_causal_token(session, token: str) -> bool:
+    """Advance `session` past the writes a previous response's token
+    describes. Unsigned, forged and malformed tokens are ignored.
+
+    Only the operation time is taken from the client, no later than the
+    latest cluster time this worker has seen; the cluster time (and its
+    signature) is never advanced from client input.
+    """
+    if not Config.CAUSAL_TOKEN_SECRET:
+        return False
+    try:
+        payload, _, mac = token.partition(".")
+        raw = b64decode(payload)
+        if not hmac.compare_digest(b64decode(mac), sign(raw)):
+            return False
+        operation_time = bson.decode(raw)["operationTime"]
+    except (ValueError, TypeError, KeyError, BSONError):
+        return False
+    if not isinstance(operation_time, Timestamp):
+        return False
+    session.advance_operation_time(cluster_clock.clamp(operation_time))
+    return True
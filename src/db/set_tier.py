@@ -0,0 +1,44 @@
+"""Change an organization's quota tier.
+
+Run with: python -m src.db.set_tier <org_id> <tier>
+
+Tiers are not part of the public API: organizations are created with
+QUOTA_DEFAULT_TIER and moved between tiers by an operator. Workers pick
+the new tier up at their next quota sync (QUOTA_SYNC_SECONDS).
+"""
+import argparse
+import asyncio
+
+from beanie import PydanticObjectId
+
+from src.core.config import Config
+from src.db.connection import create_client
+from src.organizations.models import Organization
+
+
+async def set_tier(db, org_id: PydanticObjectId, tier: str) -> bool:
+    """Set the tier of `org_id`; whether the organization exists."""
+    if tier not in Config.QUOTA_TIERS:
+        raise ValueError(f"tier must be one of {sorted(Config.QUOTA_TIERS)}")
+    result = await db[Organization.Settings.name].update_one(
+        {"_id": org_id}, {"$set": {"tier": tier}})
+    return result.matched_count == 1
+
+
+async def run(args) -> None:
+    client = create_client()
+    try:
+        if not await set_tier(client[Config.DB_NAME],
+                              PydanticObjectId(args.org_id), args.tier):
+            raise SystemExit(f"organization {args.org_id} not found")
+        print(f"set-tier {args.org_id}: {args.tier}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Change an organization's quota tier.")
+    parser.add_argument("org_id")
+    parser.add_argument("tier", choices=sorted(Config.QUOTA_TIERS))
+    asyncio.run(run(parser.parse_args()))
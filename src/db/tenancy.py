@@ -0,0 +1,149 @@
+"""Where each organization's users and notes live.
+
+With `shared` isolation they sit in the models' own collections, next to
+every other tenant's, and are told apart by `org.$id`. An organization
+with `database` isolation has a database of its own (`<DB_NAME>_<org
+id>`), one with `collection` isolation collections of their own
+(`<name>_<org id>`) in the main database. Organizations are read from
+the shared `organizations` collection either way.
+
+Handles are bound lazily: the first request of an organization on a
+worker looks its isolation up, creates the models' indexes in its
+namespace (unless SKIP_INDEX_SYNC is set) and caches the collection
+handles for later requests.
+"""
+import time
+from contextvars import ContextVar
+
+from beanie import Document
+from beanie.odm.utils.dump import get_dict
+
+from src.core.config import Config
+from src.organizations.models import Organization
+from src.users.models import User
+from src.notes.models import Note
+
+# Models stored per tenant.
+TENANT_MODELS = (User, Note)
+
+
+def to_db(document: Document) -> dict:
+    """`document` as Beanie writes it (links as DBRefs), for inserts made
+    on a tenant's collection rather than the model's own."""
+    return get_dict(document, to_db=True)
+
+
+class TenantNamespace:
+    """The collections of one organization."""
+
+    __slots__ = ("org_id", "isolation", "checked_at", "_collections")
+
+    def __init__(self, org_id, isolation: str):
+        self.org_id = org_id
+        self.isolation = isolation
+        self.checked_at = time.monotonic()
+        self._collections: dict = {}
+
+    def collection(self, model: type[Document]):
+        shared = model.get_pymongo_collection()
+        if self.isolation == "shared":
+            return shared
+
+        handle = self._collections.get(shared.name)
+        if handle is None:
+            if self.isolation == "database":
+                database = shared.database.client[
+                    f"{shared.database.name}_{self.org_id}"]
+                handle = database[shared.name]
+            else:
+                handle = shared.database[f"{shared.name}_{self.org_id}"]
+            self._collections[shared.name] = handle
+        return handle
+
+    async def create_indexes(self, models) -> None:
+        if self.isolation == "shared":
+            return
+        for model in models:
+            await self.collection(model).create_indexes(model.Settings.indexes)
+
+
+# The namespace last bound in this context (request, task), kept so a
+# request does not lose it when the registry evicts its organization.
+bound_namespace: ContextVar[TenantNamespace | None] = ContextVar(
+    "bound_namespace", default=None)
+
+
+class TenantNamespaces:
+    """Per-worker registry of the namespaces organizations are bound to,
+    refreshed every TENANT_NAMESPACE_TTL_SECONDS so a moved organization
+    is picked up without a restart. Beyond `maxsize`, the organizations
+    bound longest ago are dropped first; requests already holding one
+    keep using it (`bound_namespace`)."""
+
+    def __init__(self, maxsize: int | None = None, ttl: float | None = None):
+        self.maxsize = maxsize or Config.TENANT_NAMESPACE_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else Config.TENANT_NAMESPACE_TTL_SECONDS
+        self._namespaces: dict = {}
+
+    def lookup(self, org_id) -> TenantNamespace | None:
+        """The organization's namespace if it was bound less than `ttl`
+        seconds ago, without querying anything."""
+        namespace = self._namespaces.get(org_id)
+        if namespace is None or namespace.checked_at + self.ttl <= time.monotonic():
+            return None
+        return namespace
+
+    async def bind(self, org_id) -> TenantNamespace:
+        """The organization's namespace, looked up again once `ttl` has
+        passed, and made the `bound_namespace` of the caller's context."""
+        namespace = self.lookup(org_id)
+        if namespace is not None:
+            bound_namespace.set(namespace)
+            return namespace
+
+        namespace = self._namespaces.get(org_id)
+        org = await Organization.get_pymongo_collection().find_one(
+            {"_id": org_id}, {"isolation": 1})
+        isolation = (org or {}).get("isolation", "shared")
+        if namespace is None or namespace.isolation != isolation:
+            namespace = TenantNamespace(org_id, isolation)
+            # As at boot: with SKIP_INDEX_SYNC the sync-indexes migration
+            # creates them, isolated namespaces included.
+            if not Config.SKIP_INDEX_SYNC:
+                await namespace.create_indexes(TENANT_MODELS)
+        namespace.checked_at = time.monotonic()
+
+        self.add(namespace)
+        bound_namespace.set(namespace)
+        return namespace
+
+    def add(self, namespace: TenantNamespace) -> None:
+        self._namespaces.pop(namespace.org_id, None)
+        self._namespaces[namespace.org_id] = namespace
+        while len(self._namespaces) > self.maxsize:
+            del self._namespaces[next(iter(self._namespaces))]
+
+    def get(self, org_id) -> TenantNamespace:
+        namespace = self._namespaces.get(org_id)
+        if namespace is None:
+            raise LookupError(f"organization {org_id} is not bound to a "
+                              "namespace; call `namespaces.bind` first")
+        return namespace
+
+    def forget(self, org_id) -> None:
+        self._namespaces.pop(org_id, None)
+
+
+namespaces = TenantNamespaces()
+
+
+def tenant_collection(model: type[Document], org_id):
+    """The collection holding `org_id`'s documents of `model`. The
+    organization must have been bound in this request (TenantContext
+    and the user service do it)."""
+    if model not in TENANT_MODELS:
+        return model.get_pymongo_collection()
+    namespace = bound_namespace.get()
+    if namespace is None or namespace.org_id != org_id:
+        namespace = namespaces.get(org_id)
+    return namespace.collection(model)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from bson import ObjectId
+from fastapi import Request
+
+from src.core.config import Config, QuotaTier
+from src.organizations.models import Organization
+from src.utils.cache import TTLCache
+from src.utils.token_bucket import TokenBucket
+from src.middlewares.errors import QuotaExceeded
+
+logger = logging.getLogger("multi-tenant-notes-api")
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class OrgQuota:
+    """An organization's tier and its read/write buckets on this worker."""
+
+    __slots__ = ("tier", "buckets")
+
+    def __init__(self, tier: str | None = None):
+        # None until the organization's first sync.
+        self.tier = tier
+        self.buckets: dict[str, TokenBucket] = {}
+
+
+class QuotaManager:
+    """Per-organization read/write token buckets kept in process.
+
+    Buckets are checked without any I/O. The tier of an organization is
+    loaded in the background when this worker first sees it, and the
+    tiers of every organization it keeps are reloaded every
+    QUOTA_SYNC_SECONDS; until its first sync an organization gets the
+    default tier. At most QUOTA_CACHE_MAXSIZE organizations are kept,
+    each until it has been idle for QUOTA_IDLE_SECONDS.
+    """
+
+    def __init__(self, timer=time.monotonic, maxsize: int | None = None,
+                 idle_seconds: float | None = None):
+        self._timer = timer
+        self.orgs = TTLCache(
+            maxsize if maxsize is not None else Config.QUOTA_CACHE_MAXSIZE,
+            idle_seconds if idle_seconds is not None else Config.QUOTA_IDLE_SECONDS,
+            timer=timer,
+        )
+        self._pending: set[str] = set()
+        self._synced_at = timer()
+        self._sync_task: asyncio.Task | None = None
+
+    def entry(self, org_id: str) -> OrgQuota:
+        quota = self.orgs.get(org_id)
+        if quota is None:
+            quota = OrgQuota()
+            self._pending.add(org_id)
+        # Restart the idle timer.
+        self.orgs.set(org_id, quota)
+        return quota
+
+    def tier_of(self, quota: OrgQuota) -> QuotaTier:
+        name = quota.tier or Config.QUOTA_DEFAULT_TIER
+        return Config.QUOTA_TIERS.get(
+            name, Config.QUOTA_TIERS[Config.QUOTA_DEFAULT_TIER])
+
+    def bucket(self, quota: OrgQuota, kind: str, now: float) -> TokenBucket:
+        bucket = quota.buckets.get(kind)
+        if bucket is None:
+            tier = self.tier_of(quota)
+            share = max(1, Config.WEB_CONCURRENCY)
+            rate = getattr(tier, f"{kind}_per_second") / share
+            burst = max(1, getattr(tier, f"{kind}_burst") // share)
+            bucket = TokenBucket(rate, burst, now)
+            quota.buckets[kind] = bucket
+        return bucket
+
+    def consume(self, org_id: str, kind: str) -> tuple[bool, TokenBucket]:
+        now = self._timer()
+        quota = self.entry(org_id)
+        self.schedule_sync(now)
+        bucket = self.bucket(quota, kind, now)
+        return bucket.consume(now), bucket
+
+    def assign(self, org_id: str, tier: str) -> None:
+        """Record `org_id`'s tier, resetting its buckets if it changed."""
+        self._pending.discard(org_id)
+        quota = self.orgs.peek(org_id)
+        if quota is None:
+            self.orgs.set(org_id, OrgQuota(tier))
+        elif quota.tier != tier:
+            quota.tier = tier
+            quota.buckets.clear()
+
+    def schedule_sync(self, now: float) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._sync_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        full = now - self._synced_at >= Config.QUOTA_SYNC_SECONDS
+        if not self._pending and not full:
+            return
+        self._sync_task = loop.create_task(self.sync(full))
+
+    async def sync(self, full: bool = False) -> None:
+        """Load the tiers of the organizations seen since the last sync;
+        with `full`, reload those of every organization kept as well."""
+        arrived, self._pending = self._pending, set()
+        org_ids = arrived
+        if full:
+            org_ids = arrived | set(self.orgs.keys())
+            self._synced_at = self._timer()
+        if not org_ids:
+            return
+
+        try:
+            docs = await (Organization.get_pymongo_collection()
+                          .find({"_id": {"$in": [ObjectId(i) for i in org_ids]}},
+                                {"tier": 1})
+                          .to_list(length=None))
+        except Exception:
+            logger.exception("Quota tier sync failed")
+            # Retried on the next request, for those still kept.
+            self._pending.update(
+                i for i in arrived if self.orgs.peek(i) is not None)
+            return
+
+        for doc in docs:
+            self.assign(str(doc["_id"]), doc.get("tier", Config.QUOTA_DEFAULT_TIER))
+
+
+quota_manager = QuotaManager()
+
+
+def enforce_quota(request: Request, org) -> None:
+    """Charge one request to the organization's read or write budget and
+    expose the bucket state as X-RateLimit-* headers."""
+    if not Config.QUOTA_ENABLED:
+        return
+
+    kind = "read" if request.method in READ_METHODS else "write"
+    allowed, bucket = quota_manager.consume(str(org.id), kind)
+
+    request.state.rate_limit_headers = {
+        "X-RateLimit-Limit": str(int(bucket.capacity)),
+        "X-RateLimit-Remaining": str(int(bucket.tokens)),
+        "X-RateLimit-Reset": str(int(bucket.reset_after() + 0.999)),
+    }
+    if not allowed:
+        raise QuotaExceeded(bucket.retry_after())
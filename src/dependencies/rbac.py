@@ -1,6 +1,7 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from typing import Literal
 from src.dependencies.tenant import TenantContext
+from src.dependencies.quota import enforce_quota
 from src.middlewares.errors import InvalidRoleAccess
 
 tenant_ctx = TenantContext()
@@ -10,9 +11,10 @@ Role = Literal["reader", "writer", "admin"]
 
 
 def require_role(*allowed_roles: Role):
-    async def role_checker(ctx=Depends(tenant_ctx)):
-        user = ctx["user"]
-        if user.role not in allowed_roles:
+    async def role_checker(request: Request, ctx=Depends(tenant_ctx)):
+        if ctx["role"] not in allowed_roles:
             raise InvalidRoleAccess()
+        request.state.org_id = str(ctx["org"].id)
+        enforce_quota(request, ctx["org"])
         return ctx
     return role_checker
@@ -2,32 +2,135 @@ from fastapi import Header
 from src.organizations.models import Organization
 from src.users.models import User
 from beanie import PydanticObjectId
+from bson.errors import InvalidId
 
-from src.utils.link_resolver import BaseService
+from src.core.config import Config
+from src.db.tenancy import bound_namespace, namespaces
+from src.auth.services import token_svc
+from src.utils.cache import TTLCache
+from src.utils.link_resolver import link_id
+from src.middlewares.metrics import cache_metrics
 from src.middlewares.errors import (
-    MissingHeaders, OrganizationOrUserNotFound, UserDoesNotBelongToOrganization
+    MissingHeaders, OrganizationOrUserNotFound,
+    UserDoesNotBelongToOrganization, InvalidTenantToken
 )
 
+tenant_cache = TTLCache(maxsize=Config.TENANT_CACHE_MAXSIZE,
+                        ttl=Config.TENANT_CACHE_TTL_SECONDS)
+cache_metrics.watch("tenant", tenant_cache)
 
-class TenantContext(BaseService):
+
+def invalidate_tenant_cache(org_id=None, user_id=None) -> int:
+    """Evict cached contexts for an organization and/or a user.
+
+    Must be called whenever a user's role or organization membership
+    changes so the next request re-resolves it from the database.
+    """
+    org_id = str(org_id) if org_id else None
+    user_id = str(user_id) if user_id else None
+
+    def matches(key):
+        cached_org_id, cached_user_id = key
+        return cached_org_id == org_id or cached_user_id == user_id
+
+    return tenant_cache.invalidate(matches)
+
+
+class TenantContext:
+
+    def __init__(self, issuer: bool = False):
+        # Issuing endpoints keep accepting raw headers even when
+        # TENANT_TOKEN_REQUIRED is set, otherwise no token could be minted,
+        # and always resolve the org and user from the database: a token
+        # must not renew itself for a user since removed or given
+        # another role.
+        self.issuer = issuer
 
     async def __call__(
         self,
         x_org_id: str = Header(None),
-        x_user_id: str = Header(None)
+        x_user_id: str = Header(None),
+        authorization: str = Header(None)
     ):
-        if not x_org_id or not x_user_id:
-            raise MissingHeaders()
+        if authorization:
+            ctx = self.context_from_token(authorization)
+            if x_org_id and x_org_id != str(ctx["org"].id):
+                raise UserDoesNotBelongToOrganization()
+            if self.issuer:
+                ctx = await self.resolve_context(str(ctx["org"].id),
+                                                 str(ctx["user"].id))
+        else:
+            if Config.TENANT_TOKEN_REQUIRED and not self.issuer:
+                raise InvalidTenantToken()
 
-        org = await Organization.get(PydanticObjectId(x_org_id))
-        user = await User.get(PydanticObjectId(x_user_id))
+            if not x_org_id or not x_user_id:
+                raise MissingHeaders()
+
+            cache_key = self.cache_key(x_org_id, x_user_id)
+            ctx = None if self.issuer else tenant_cache.get(cache_key)
+            if ctx is None:
+                ctx = await self.resolve_context(*cache_key)
+                tenant_cache.set(cache_key, ctx)
 
-        if not org or not user:
+        # Select the organization's namespace; only a first or expired
+        # lookup costs a query.
+        org_id = ctx["org"].id
+        namespace = namespaces.lookup(org_id)
+        if namespace is None:
+            await namespaces.bind(org_id)
+        else:
+            bound_namespace.set(namespace)
+        return ctx
+
+    @staticmethod
+    def cache_key(x_org_id: str, x_user_id: str) -> tuple[str, str]:
+        """The ids in canonical form, as `invalidate_tenant_cache` matches
+        them: ObjectId also accepts uppercase hex."""
+        try:
+            return str(PydanticObjectId(x_org_id)), str(PydanticObjectId(x_user_id))
+        except (InvalidId, TypeError):
+            raise OrganizationOrUserNotFound()
+
+    async def resolve_context(self, x_org_id: str, x_user_id: str):
+        org = await Organization.get(PydanticObjectId(x_org_id))
+        if not org:
             raise OrganizationOrUserNotFound()
 
-        user_org = await self.resolve_link(user.org)
+        # The user is looked up in the organization's own namespace.
+        namespace = await namespaces.bind(org.id)
+        user = await namespace.collection(User).find_one(
+            {"_id": PydanticObjectId(x_user_id)})
+        if not user:
+            raise OrganizationOrUserNotFound()
+        user = User.model_validate(user)
 
-        if str(user_org.id) != str(org.id):
+        if link_id(user.org) != org.id:
             raise UserDoesNotBelongToOrganization()
 
-        return {"org": org, "user": user}
+        return {"org": org, "user": user, "role": user.role}
+
+    def context_from_token(self, authorization: str):
+        """Rebuild the tenant context from a signed bearer token without
+        querying the database."""
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise InvalidTenantToken()
+
+        claims = token_svc.decode_token(token)
+        try:
+            org = Organization.model_construct(
+                id=PydanticObjectId(claims["org_id"]),
+                name=claims["org_name"],
+                description=claims.get("org_description"),
+            )
+            user = User.model_construct(
+                id=PydanticObjectId(claims["sub"]),
+                email=claims["email"],
+                full_name=claims["full_name"],
+                role=claims["role"],
+                org=org,
+            )
+        except (KeyError, InvalidId):
+            raise InvalidTenantToken()
+
+        return {"org": org, "user": user, "role": user.role}
@@ -5,8 +5,10 @@ from src.db.connection import init_db
 from src.middlewares import register_middleware
 from src.organizations.routes import org_router
 from src.users.routes import user_router
-from src.notes.routes import note_router
+from src.notes.routes import note_router, note_bulk_router
+from src.auth.routes import auth_router
 from src.middlewares.rate_limit import apply_rate_limit_to_router
+from src.core.config import Config
 
 
 @asynccontextmanager
@@ -23,18 +25,27 @@ async def life_span(app: FastAPI):
 
 def register_routers(app: FastAPI) -> None:
 
-    apply_rate_limit_to_router(org_router, "5/minute")
+    apply_rate_limit_to_router(org_router, Config.RATE_LIMIT_DEFAULT)
     app.include_router(org_router, prefix="/organizations",
                        tags=["Organizations"])
 
-    apply_rate_limit_to_router(user_router, "5/minute")
+    apply_rate_limit_to_router(user_router, Config.RATE_LIMIT_DEFAULT)
     app.include_router(user_router, prefix="/organizations/{org_id}/users",
                        tags=["users"])
 
-    apply_rate_limit_to_router(note_router, "5/minute")
+    apply_rate_limit_to_router(note_bulk_router, Config.NOTES_BULK_RATE_LIMIT)
+    app.include_router(note_bulk_router, prefix="/notes",
+                       tags=["notes"])
+
+    # Tenant-scoped note routes are throttled per organization by the
+    # quota tiers enforced in require_role instead of a flat limit.
     app.include_router(note_router, prefix="/notes",
                        tags=["notes"])
 
+    apply_rate_limit_to_router(auth_router, Config.RATE_LIMIT_DEFAULT)
+    app.include_router(auth_router, prefix="/auth",
+                       tags=["auth"])
+
 
 def create_app() -> FastAPI:
 
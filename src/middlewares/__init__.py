@@ -3,10 +3,20 @@ from src.middlewares.logging import set_up_logging
 from src.middlewares.rate_limit import set_up_limiter
 from src.middlewares.cors import set_up_cors
 from src.middlewares.errors import set_up_error_handlers
+from src.middlewares.quota import set_up_quota_headers
+from src.middlewares.read_routing import set_up_read_routing
+from src.middlewares.compression import set_up_compression
+from src.middlewares.metrics import set_up_metrics
+from src.middlewares.profiling import set_up_profiling
 
 
 def register_middleware(app: FastAPI):
     set_up_error_handlers(app)
     set_up_limiter(app)
     set_up_cors(app)
+    set_up_quota_headers(app)
+    set_up_read_routing(app)
+    set_up_compression(app)
+    set_up_profiling(app)
+    set_up_metrics(app)
     set_up_logging(app)
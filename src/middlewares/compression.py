@@ -0,0 +1,231 @@
+import hashlib
+import zlib
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.core.config import Config
+from src.utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the package is installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd likewise
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def gzip_compressor(level: int | None):
+    return zlib.compressobj(-1 if level is None else level,
+                            zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def zstd_compressor(level: int | None):
+    return zstandard.ZstdCompressor(level=level or 3).compressobj()
+
+
+class BrotliCompressor:
+    """A brotli compressor with the compress()/flush(mode) interface of
+    the zlib and zstandard ones."""
+
+    FLUSH, FINISH = "flush", "finish"
+
+    def __init__(self, level: int | None):
+        self._compressor = brotli.Compressor(quality=4 if level is None else level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self, mode: str = FINISH) -> bytes:
+        if mode == self.FLUSH:
+            return self._compressor.flush()
+        return self._compressor.finish()
+
+
+COMPRESSORS = {"gzip": gzip_compressor}
+# The flush() mode that emits everything compressed so far without
+# ending the stream, so each streamed chunk reaches the client at once.
+SYNC_FLUSH = {"gzip": zlib.Z_SYNC_FLUSH}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+    SYNC_FLUSH["br"] = BrotliCompressor.FLUSH
+if zstandard is not None:
+    COMPRESSORS["zstd"] = zstd_compressor
+    SYNC_FLUSH["zstd"] = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+# (org id, path, query string, encoding) -> (digest of the uncompressed
+# body, compressed body).
+compressed_cache = TTLCache(maxsize=Config.COMPRESSION_CACHE_MAXSIZE,
+                            ttl=Config.COMPRESSION_CACHE_TTL_SECONDS)
+
+
+def q_value(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The encoding to answer with: the one the client weights highest
+    among those we can produce, our preference order breaking ties."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weights[name.strip().lower()] = q_value(params)
+
+    default = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in Config.COMPRESSION_ENCODINGS:
+        q = weights.get(encoding, default)
+        if encoding in COMPRESSORS and q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(encoding: str, body: bytes) -> bytes:
+    compressor = COMPRESSORS[encoding](Config.COMPRESSION_LEVELS.get(encoding))
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressedResponse:
+    """The send side of one response being compressed with `encoding`.
+
+    A response of known length (Content-Length) is gathered and
+    compressed whole, when it reaches COMPRESSION_MIN_SIZE; a streamed
+    one is compressed and flushed chunk by chunk.
+    """
+
+    def __init__(self, scope, send, encoding: str):
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self._start = None
+        self._compressor = None
+        self._passthrough = False
+        self._sized = False
+        self._body: list[bytes] = []
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            self._passthrough = not self.compressible(headers)
+            self._sized = "content-length" in headers
+            if self._passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+        elif self._sized:
+            # Sized bodies may still arrive in pieces (BaseHTTPMiddleware
+            # re-streams them); they are already in memory upstream.
+            self._body.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self.send_whole(b"".join(self._body))
+        else:
+            await self.send_chunk(message)
+
+    @staticmethod
+    def compressible(headers: Headers) -> bool:
+        return ("content-encoding" not in headers
+                and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES))
+
+    async def send_whole(self, body: bytes):
+        if len(body) < Config.COMPRESSION_MIN_SIZE:
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        payload = self.cached_compress(body)
+        headers = self.encoded_headers()
+        headers["content-length"] = str(len(payload))
+        self._start["headers"] = headers.raw
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": payload})
+
+    async def send_chunk(self, message):
+        if self._compressor is None:
+            self._compressor = COMPRESSORS[self.encoding](
+                Config.COMPRESSION_LEVELS.get(self.encoding))
+            headers = self.encoded_headers()
+            del headers["content-length"]
+            self._start["headers"] = headers.raw
+            await self._send(self._start)
+
+        more_body = message.get("more_body", False)
+        body = message.get("body", b"")
+        payload = self._compressor.compress(body)
+        if not more_body:
+            payload += self._compressor.flush()
+        elif body:
+            payload += self._compressor.flush(SYNC_FLUSH[self.encoding])
+        if payload or not more_body:
+            await self._send({"type": "http.response.body", "body": payload,
+                              "more_body": more_body})
+
+    def encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=list(self._start["headers"]))
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+
+    def cache_key(self) -> tuple | None:
+        route = getattr(self.scope.get("route"), "path", None)
+        if (self._start["status"] != 200 or self.scope["method"] != "GET"
+                or route not in Config.COMPRESSION_CACHED_ROUTES):
+            return None
+        org_id = self.scope.get("state", {}).get("org_id")
+        return (org_id, self.scope["path"], self.scope["query_string"],
+                self.encoding)
+
+    def cached_compress(self, body: bytes) -> bytes:
+        """Compress `body`, reusing the payload compressed for the same
+        tenant and list when the body has not changed since."""
+        key = self.cache_key()
+        if key is None:
+            return compress(self.encoding, body)
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        cached = compressed_cache.get(key)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+
+        payload = compress(self.encoding, body)
+        compressed_cache.set(key, (digest, payload))
+        return payload
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts
+    (Accept-Encoding) among COMPRESSION_ENCODINGS."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not Config.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        response = CompressedResponse(scope, send, encoding)
+        await self.app(scope, receive, response.send)
+
+
+def set_up_compression(app: FastAPI):
+    app.add_middleware(CompressionMiddleware)
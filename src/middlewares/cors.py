@@ -8,5 +8,8 @@ def set_up_cors(app: FastAPI):
         allow_origins=["*"],
         allow_methods=["*"],
         allow_headers=["*"],
-        allow_credentials=True
+        allow_credentials=True,
+        expose_headers=["X-Next-Cursor", "X-RateLimit-Limit",
+                        "X-RateLimit-Remaining", "X-RateLimit-Reset",
+                        "Retry-After", "X-Causal-Token", "ETag"],
     )
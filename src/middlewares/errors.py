@@ -1,8 +1,11 @@
+import math
 from typing import Any, Callable
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, status
 
+from src.middlewares.metrics import record_rejection
+
 
 class OrganizationNotFound(Exception):
     """Raised when an organization with the specified ID does not exist."""
@@ -49,6 +52,38 @@ class InvalidRoleAccess(Exception):
     """Raised when a user with an invalid role tries to perform an action."""
 
 
+class InvalidTenantToken(Exception):
+    """Raised when a tenant token is missing, malformed, expired or
+    carries an invalid signature."""
+
+
+class TenantTokensDisabled(Exception):
+    """Raised when a tenant token is requested but no signing secret
+    is configured."""
+
+
+class InvalidCursor(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class QuotaExceeded(Exception):
+    """Raised when an organization has used up its request budget."""
+
+    def __init__(self, retry_after: float):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+async def quota_exceeded_handler(request: Request, exc: QuotaExceeded):
+    record_rejection(request, "quota")
+    return JSONResponse(
+        content={"message": "Request quota exceeded for this organization",
+                 "error_code": "quota_exceeded"},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 def create_exception_handler(
     status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -169,3 +204,35 @@ def set_up_error_handlers(app: FastAPI):
                 "error_code": "invalid_role"},
         ),
     )
+
+    app.add_exception_handler(
+        InvalidTenantToken,
+        create_exception_handler(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            initial_detail={
+                "message": "Invalid or expired tenant token",
+                "error_code": "invalid_token"},
+        ),
+    )
+
+    app.add_exception_handler(
+        TenantTokensDisabled,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "Tenant tokens are not enabled",
+                "error_code": "tokens_disabled"},
+        ),
+    )
+
+    app.add_exception_handler(
+        InvalidCursor,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Invalid pagination cursor",
+                "error_code": "invalid_cursor"},
+        ),
+    )
+
+    app.add_exception_handler(QuotaExceeded, quota_exceeded_handler)
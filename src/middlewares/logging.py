@@ -1,19 +1,118 @@
+import atexit
+import json
 import logging
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import os
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+from fastapi import FastAPI
+
+from src.core.config import Config
+from src.db.monitoring import RequestStats, request_stats
 
 logger = logging.getLogger("multi-tenant-notes-api")
-logging.basicConfig(level=logging.INFO,
-                    format="%(asctime)s - %(levelname)s - %(message)s")
+access_logger = logging.getLogger("multi-tenant-notes-api.access")
+
+_handler: QueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as one JSON line, merging its `fields` extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging() -> None:
+    """Route every log record through a queue; a background thread does
+    the formatting and the blocking write to stderr."""
+    global _handler
+    if _handler is not None:
+        return
+
+    _handler = QueueHandler(SimpleQueue())
+    root = logging.getLogger()
+    root.handlers = [_handler]
+    root.setLevel(Config.LOG_LEVEL)
+
+    start_listener()
+    atexit.register(lambda: _listener.stop())
+    # Threads do not survive fork: workers forked from a preloading
+    # gunicorn master need their own queue and listener.
+    os.register_at_fork(after_in_child=start_listener)
+
+
+def start_listener() -> None:
+    global _listener
+    stream = logging.StreamHandler()
+    stream.setFormatter(JsonFormatter())
+
+    _handler.queue = SimpleQueue()
+    _listener = QueueListener(_handler.queue, stream,
+                              respect_handler_level=True)
+    _listener.start()
+
+
+class LoggingMiddleware:
+    """Emit one structured access log line per HTTP request.
+
+    Error responses are always logged; successful ones are sampled at
+    `LOG_SUCCESS_SAMPLE_RATE`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_stats.reset(token)
+            duration_ms = (time.perf_counter() - start) * 1000
+            if status >= 400 or random.random() < Config.LOG_SUCCESS_SAMPLE_RATE:
+                self.log(scope, state, status, duration_ms, stats)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info(f"Incoming request: {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Response status: {response.status_code}")
-        return response
+    @staticmethod
+    def log(scope, state, status, duration_ms, stats):
+        route = scope.get("route")
+        access_logger.info("request", extra={"fields": {
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "status": status,
+            "duration_ms": round(duration_ms, 2),
+            "org_id": state.get("org_id"),
+            "db_calls": stats.db_calls,
+        }})
 
 
 def set_up_logging(app: FastAPI):
+    configure_logging()
     app.add_middleware(LoggingMiddleware)
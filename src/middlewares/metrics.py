@@ -0,0 +1,133 @@
+import os
+import time
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+    Histogram, generate_latest, multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent serving HTTP requests.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected with 429, by the limiter that rejected them.",
+    ["limiter", "route"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Lookups in the in-process caches, by cache and result.",
+    ["cache", "result"],
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries held by the in-process caches.",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+
+# Requests that match no route share one label so unknown paths cannot
+# create unbounded series.
+UNMATCHED_ROUTE = "<unmatched>"
+# The caches count their own hits and misses; a worker adds them to
+# CACHE_LOOKUPS at most this often, after a request or on a scrape.
+CACHE_PUBLISH_SECONDS = 1.0
+
+
+class CacheMetrics:
+    """Publish the `stats()` of watched TTLCaches as CACHE_LOOKUPS and
+    CACHE_ENTRIES, so lookups cost no metric update."""
+
+    def __init__(self):
+        self.caches = {}
+        self.published_at = float("-inf")
+        self._published: dict[str, tuple[int, int]] = {}
+
+    def watch(self, name: str, cache) -> None:
+        self.caches[name] = cache
+        self._published[name] = (0, 0)
+
+    def publish(self, now: float) -> None:
+        self.published_at = now
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            hits, misses = self._published[name]
+            CACHE_LOOKUPS.labels(name, "hit").inc(stats["hits"] - hits)
+            CACHE_LOOKUPS.labels(name, "miss").inc(stats["misses"] - misses)
+            CACHE_ENTRIES.labels(name).set(stats["size"])
+            self._published[name] = (stats["hits"], stats["misses"])
+
+    def maybe_publish(self, now: float) -> None:
+        if now - self.published_at >= CACHE_PUBLISH_SECONDS:
+            self.publish(now)
+
+
+cache_metrics = CacheMetrics()
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """Record the latency and in-flight count of every HTTP request,
+    labelled by route template rather than raw path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            end = time.perf_counter()
+            REQUEST_LATENCY.labels(method, route_template(scope),
+                                   str(status)).observe(end - start)
+            cache_metrics.maybe_publish(end)
+
+
+def record_rejection(request: Request, limiter: str):
+    RATE_LIMIT_REJECTIONS.labels(limiter, route_template(request.scope)).inc()
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint; aggregates all workers when
+    PROMETHEUS_MULTIPROC_DIR is set."""
+    cache_metrics.publish(time.perf_counter())
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def set_up_metrics(app: FastAPI):
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
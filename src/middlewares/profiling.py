@@ -0,0 +1,85 @@
+import logging
+
+from fastapi import FastAPI
+
+from src.core.config import Config
+from src.db.monitoring import RequestStats, request_stats
+from src.middlewares.metrics import route_template
+
+logger = logging.getLogger("multi-tenant-notes-api.profiler")
+
+# Commands expected to repeat within one request (cursor batches, cleanup).
+REPEATABLE_COMMANDS = {"getMore", "killCursors", "endSessions"}
+
+
+def suspected_n_plus_one(stats: RequestStats) -> dict[str, int]:
+    """Query shapes issued at least QUERY_PROFILER_REPEAT_THRESHOLD times."""
+    return {
+        shape: count for shape, count in stats.shapes.items()
+        if count >= Config.QUERY_PROFILER_REPEAT_THRESHOLD
+        and shape.split(" ", 1)[0] not in REPEATABLE_COMMANDS
+    }
+
+
+def server_timing(stats: RequestStats, repeated: dict[str, int]) -> str:
+    timing = (f'db;dur={stats.db_seconds * 1000:.2f};'
+              f'desc="{stats.db_calls} queries"')
+    if repeated:
+        timing += f', n-plus-one;desc="{len(repeated)} repeated shapes"'
+    return timing
+
+
+class QueryProfilerMiddleware:
+    """Opt-in (QUERY_PROFILER_ENABLED) count and timing of the MongoDB
+    commands behind each request, reported in a Server-Timing header and
+    the debug log. Repeated query shapes are flagged as suspected N+1."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not Config.QUERY_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = request_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = request_stats.set(stats)
+        stats.enable_profiling()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = server_timing(stats, suspected_n_plus_one(stats))
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if token is not None:
+                request_stats.reset(token)
+            self.report(scope, stats)
+
+    @staticmethod
+    def report(scope, stats: RequestStats):
+        repeated = suspected_n_plus_one(stats)
+        fields = {
+            "route": route_template(scope),
+            "db_calls": stats.db_calls,
+            "db_ms": round(stats.db_seconds * 1000, 2),
+            "shapes": dict(stats.shapes),
+        }
+        if repeated:
+            logger.warning("suspected N+1 queries",
+                           extra={"fields": {**fields, "repeated": repeated}})
+        else:
+            logger.debug("query profile", extra={"fields": fields})
+
+
+def set_up_profiling(app: FastAPI):
+    app.add_middleware(QueryProfilerMiddleware)
@@ -0,0 +1,32 @@
+from fastapi import FastAPI
+
+
+class RateLimitHeadersMiddleware:
+    """Copy the X-RateLimit-* headers computed by `enforce_quota` onto the
+    response, whichever way the response was produced (model, raw
+    `Response`, stream or error handler)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_with_headers(message):
+            headers = state.get("rate_limit_headers")
+            if message["type"] == "http.response.start" and headers:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    *((k.lower().encode(), v.encode()) for k, v in headers.items()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def set_up_quota_headers(app: FastAPI):
+    app.add_middleware(RateLimitHeadersMiddleware)
@@ -1,13 +1,94 @@
 from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler
 from slowapi.middleware import SlowAPIMiddleware
 
-limiter = Limiter(key_func=get_remote_address)
+from src.core.config import Config
+from src.middlewares.errors import InvalidTenantToken
+from src.middlewares.metrics import record_rejection
+
+
+def get_tenant_identity(request: Request) -> tuple[str, str] | None:
+    """Return the (org id, user id) of a verified bearer token, if any.
+
+    The limiter runs before TenantContext, so raw X-Org-ID/X-User-ID
+    headers are not trusted here: a client could send new ones with
+    every request and get a fresh bucket each time. Requests without a
+    valid token are keyed by their remote address instead.
+    """
+    # Imported here: src.auth imports this package's error types.
+    from src.auth.services import token_svc
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        claims = token_svc.decode_token(token)
+    except InvalidTenantToken:
+        return None
+    return claims.get("org_id"), claims.get("sub")
+
+
+def get_org_key(request: Request) -> str:
+    identity = get_tenant_identity(request)
+    if identity is None:
+        return f"ip:{get_remote_address(request)}"
+    return f"org:{identity[0]}"
+
+
+def get_user_key(request: Request) -> str:
+    identity = get_tenant_identity(request)
+    if identity is None:
+        return f"ip:{get_remote_address(request)}"
+    return f"user:{identity[0]}:{identity[1]}"
+
+
+KEY_FUNCS = {
+    "ip": get_remote_address,
+    "org": get_org_key,
+    "user": get_user_key,
+}
+
+
+def storage_options(uri: str) -> dict:
+    """Client options bounding each round trip to a shared store.
+
+    limits' storage clients are synchronous: every rate-limited request
+    waits for its counter on the event loop, stalling the worker's other
+    requests meanwhile, and an unreachable store would do so until the
+    driver's default timeouts (30s for server selection) before the
+    in-memory fallback takes over.
+    """
+    timeout_ms = Config.RATE_LIMIT_STORAGE_TIMEOUT_MS
+    if uri.startswith("mongodb"):
+        return {"serverSelectionTimeoutMS": timeout_ms,
+                "connectTimeoutMS": timeout_ms,
+                "socketTimeoutMS": timeout_ms}
+    if uri.startswith("redis"):
+        return {"socket_timeout": timeout_ms / 1000,
+                "socket_connect_timeout": timeout_ms / 1000}
+    return {}
+
+
+limiter = Limiter(
+    key_func=KEY_FUNCS[Config.RATE_LIMIT_KEY],
+    storage_uri=Config.RATE_LIMIT_STORAGE_URI,
+    storage_options=storage_options(Config.RATE_LIMIT_STORAGE_URI),
+    # Keep serving with per-worker counters if a shared store goes down.
+    in_memory_fallback_enabled=True,
+)
+
+
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    record_rejection(request, "slowapi")
+    return await http_exception_handler(request, exc)
 
 
 def set_up_limiter(app: FastAPI):
     app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     app.add_middleware(SlowAPIMiddleware)
 
 
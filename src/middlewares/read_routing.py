@@ -0,0 +1,58 @@
+from fastapi import FastAPI
+
+from src.core.config import Config
+from src.db.routing import (
+    RequestSession, request_session, encode_causal_token, apply_causal_token,
+)
+
+CAUSAL_TOKEN_HEADER = b"x-causal-token"
+
+
+class ReadRoutingMiddleware:
+    """Serve each request inside a causally consistent MongoDB session.
+
+    Reads go to the read preference of their route; the response carries
+    an X-Causal-Token (signed with CAUSAL_TOKEN_SECRET) which, sent back
+    on a later request, makes that request's reads (even from a
+    secondary) include this one's writes. Only active when
+    READ_ROUTING_PREFERENCE is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or Config.READ_ROUTING_PREFERENCE is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Imported here: the models are only bound once Beanie is initialized.
+        from src.notes.models import Note
+
+        client = Note.get_pymongo_collection().database.client
+        session = await client.start_session(causal_consistency=True)
+
+        for name, value in scope["headers"]:
+            if name == CAUSAL_TOKEN_HEADER:
+                apply_causal_token(session, value.decode("latin-1"))
+
+        async def send_with_token(message):
+            if message["type"] == "http.response.start":
+                token = encode_causal_token(session)
+                if token:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (CAUSAL_TOKEN_HEADER, token.encode()),
+                    ]
+            await send(message)
+
+        ctx_token = request_session.set(RequestSession(scope, session))
+        try:
+            await self.app(scope, receive, send_with_token)
+        finally:
+            request_session.reset(ctx_token)
+            await session.end_session()
+
+
+def set_up_read_routing(app: FastAPI):
+    app.add_middleware(ReadRoutingMiddleware)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from beanie import Document
+from prometheus_client import Histogram
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+from src.core.config import Config
+from src.db.routing import request_session
+from src.db.tenancy import to_db
+
+WRITE_BATCH_SIZE = Histogram(
+    "note_write_batch_size",
+    "Notes per coalesced write batch.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+WRITE_WAIT = Histogram(
+    "note_write_wait_seconds",
+    "Time an insert waited for its batch to be sent.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+
+class PendingWrite:
+    __slots__ = ("document", "collection", "future", "session", "queued_at")
+
+    def __init__(self, document: Document, collection,
+                 future: asyncio.Future, session):
+        self.document = document
+        self.collection = collection
+        self.future = future
+        self.session = session
+        self.queued_at = time.monotonic()
+
+
+def write_error(error: dict) -> WriteError:
+    """The exception a single insert would have raised for one entry of a
+    BulkWriteError's writeErrors."""
+    cls = DuplicateKeyError if error.get("code") == 11000 else WriteError
+    return cls(error.get("errmsg"), error.get("code"), error)
+
+
+class WriteCoalescer:
+    """Group commit for single-document inserts.
+
+    Inserts arriving within `window` seconds of the first one, or until
+    `batch_size` are queued, are sent with one unordered insert_many per
+    target collection (one per tenant namespace). Each caller waits for
+    its own document: it returns once the batch is written, or raises
+    the error its document got. Documents must carry their id before
+    they are queued.
+    """
+
+    def __init__(self,
+                 batch_size: int | None = None,
+                 window: float | None = None):
+        self.batch_size = batch_size or Config.NOTES_WRITE_BATCH_SIZE
+        self.window = (window if window is not None
+                       else Config.NOTES_WRITE_WINDOW_MS / 1000)
+        self._pending: list[PendingWrite] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def insert(self, document: Document, collection) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # A new event loop (tests, worker restart): nothing queued on
+            # the old one can still be awaited.
+            self._loop, self._pending, self._timer = loop, [], None
+
+        ctx = request_session.get()
+        write = PendingWrite(document, collection, loop.create_future(),
+                             ctx.session if ctx is not None else None)
+        self._pending.append(write)
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+
+        # Shielded: a cancelled caller does not cancel its write, which
+        # may already be on its way with the rest of the batch.
+        await asyncio.shield(write.future)
+
+    def flush(self) -> None:
+        """Send whatever is queued now, without waiting for the window."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = self._loop.create_task(self.write(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def write(self, batch: list[PendingWrite]) -> None:
+        started = time.monotonic()
+        for write in batch:
+            WRITE_WAIT.observe(started - write.queued_at)
+        WRITE_BATCH_SIZE.observe(len(batch))
+
+        groups: dict[str, list[PendingWrite]] = {}
+        for write in batch:
+            groups.setdefault(write.collection.full_name, []).append(write)
+
+        try:
+            session = await self.causal_session(batch)
+        except Exception as exc:
+            self.resolve(batch, dict.fromkeys(range(len(batch)), exc))
+            return
+
+        try:
+            # One after the other: a session is not for concurrent use.
+            for group in groups.values():
+                await self.write_group(group, session)
+        finally:
+            if session is not None:
+                self.advance_sessions(batch, session)
+                await session.end_session()
+
+    async def write_group(self, group: list[PendingWrite], session) -> None:
+        errors = {}
+        try:
+            await group[0].collection.insert_many(
+                [to_db(write.document) for write in group], ordered=False,
+                **({"session": session} if session is not None else {}))
+        except BulkWriteError as exc:
+            errors = {error["index"]: write_error(error)
+                      for error in exc.details.get("writeErrors", [])}
+        except Exception as exc:
+            errors = dict.fromkeys(range(len(group)), exc)
+        self.resolve(group, errors)
+
+    @staticmethod
+    def resolve(writes: list[PendingWrite], errors: dict) -> None:
+        for i, write in enumerate(writes):
+            if write.future.done():
+                continue
+            if i in errors:
+                write.future.set_exception(errors[i])
+            else:
+                write.future.set_result(None)
+
+    async def causal_session(self, batch: list[PendingWrite]):
+        """A session for the batch when any caller is reading through a
+        causally consistent session (read routing), so each of them can
+        be advanced past the batch's write."""
+        if all(write.session is None for write in batch):
+            return None
+        client = batch[0].collection.database.client
+        return await client.start_session(causal_consistency=True)
+
+    @staticmethod
+    def advance_sessions(batch: list[PendingWrite], session) -> None:
+        if session.operation_time is None:
+            return
+        for write in batch:
+            if write.session is not None:
+                write.session.advance_operation_time(session.operation_time)
+                write.session.advance_cluster_time(session.cluster_time)
@@ -1,19 +1,57 @@
 from datetime import datetime, timezone
 from beanie import Document, Link
-from pydantic import Field
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, TEXT, IndexModel
 from src.organizations.models import Organization
 from src.users.models import User
 
 
+class OrgSnapshot(BaseModel):
+    """Organization fields shown with a note, copied in at write time."""
+    name: str
+    description: str | None = None
+
+    @classmethod
+    def from_document(cls, org):
+        return cls(name=org.name, description=org.description)
+
+
+class AuthorSnapshot(BaseModel):
+    """Author fields shown with a note, copied in at write time."""
+    email: str
+    full_name: str
+    role: str
+
+    @classmethod
+    def from_document(cls, user):
+        return cls(email=user.email, full_name=user.full_name, role=user.role)
+
+
 class Note(Document):
     title: str
     content: str
     org: Link[Organization]
     author: Link[User]
+    # Denormalized so reads need no lookups; kept current by
+    # `snapshot_refresher`. Notes written before they existed have None.
+    org_snapshot: OrgSnapshot | None = None
+    author_snapshot: AuthorSnapshot | None = None
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
 
     class Settings:
         name = "notes"
-        fetch_links = True
+        indexes = [
+            IndexModel(
+                [("org.$id", ASCENDING), ("created_at", ASCENDING),
+                 ("_id", ASCENDING)],
+                name="org_created_at_id",
+            ),
+            IndexModel(
+                [("org.$id", ASCENDING), ("title", TEXT), ("content", TEXT)],
+                weights={"title": 10, "content": 1},
+                name="org_title_content_text",
+            ),
+            IndexModel([("author.$id", ASCENDING)], name="author_id"),
+        ]
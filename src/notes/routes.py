@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Request, status, Depends
+from fastapi import APIRouter, Request, Query, status, Depends
+from fastapi.responses import StreamingResponse
 from beanie import PydanticObjectId
 
+from src.core.config import Config
 from src.dependencies.tenant import TenantContext
 from src.dependencies.rbac import require_role
-from src.notes.schemas import NoteCreateSchema, NoteReadSchema
+from src.notes.schemas import (
+    NoteCreateSchema, NoteReadSchema, NoteSummarySchema,
+    NoteBulkCreateSchema, NoteBulkResultSchema,
+    note_adapter, note_list_adapter, note_summary_list_adapter
+)
 from src.notes.services import note_svc
+from src.organizations.versions import collection_etag
+from src.utils.etag import etag_matches, not_modified
+from src.utils.serialization import json_response
 
 tenant_ctx = TenantContext()
 
 note_router = APIRouter()
 
+# Kept on its own router so it gets its own rate limit: one bulk request
+# counts as a single unit regardless of how many notes it carries.
+note_bulk_router = APIRouter()
+
 
 @note_router.post("/", response_model=NoteReadSchema,
                   status_code=status.HTTP_201_CREATED)
@@ -25,15 +38,67 @@ async def create_note(request: Request,
     return note
 
 
+@note_bulk_router.post("/bulk", response_model=NoteBulkResultSchema,
+                       status_code=status.HTTP_201_CREATED)
+async def create_notes(request: Request,
+                       payload: NoteBulkCreateSchema,
+                       ctx=Depends(require_role("writer", "admin"))):
+
+    org = ctx["org"]
+    user = ctx["user"]
+
+    return await note_svc.create_notes(org, user, payload.notes)
+
+
 @note_router.get("/", response_model=list[NoteReadSchema])
-async def list_notes(request: Request, ctx=Depends(
-        require_role("reader", "writer", "admin"))):
+async def list_notes(request: Request,
+                     limit: int = Query(Config.NOTES_PAGE_SIZE, ge=1,
+                                        le=Config.NOTES_MAX_PAGE_SIZE),
+                     cursor: str | None = None,
+                     ctx=Depends(require_role("reader", "writer", "admin"))):
 
     org = ctx["org"]
     user = ctx["user"]
 
-    notes = await note_svc.list_notes(org, user)
-    return notes
+    # Checked before the list query: an unchanged collection costs one
+    # lookup of the organization's version.
+    etag = await collection_etag(org.id, "notes")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    notes, next_cursor = await note_svc.list_notes(org, user, limit, cursor)
+    headers = {"ETag": etag} if etag else {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return json_response(note_list_adapter, notes, headers=headers)
+
+
+@note_router.get("/search", response_model=list[NoteSummarySchema])
+async def search_notes(request: Request,
+                       q: str = Query(..., min_length=1, max_length=256),
+                       limit: int = Query(Config.NOTES_PAGE_SIZE, ge=1,
+                                          le=Config.NOTES_MAX_PAGE_SIZE),
+                       offset: int = Query(0, ge=0),
+                       ctx=Depends(require_role("reader", "writer", "admin"))):
+
+    org = ctx["org"]
+    user = ctx["user"]
+
+    notes = await note_svc.search_notes(org, user, q, limit, offset)
+    return json_response(note_summary_list_adapter, notes)
+
+
+@note_router.get("/export", response_class=StreamingResponse)
+async def export_notes(request: Request,
+                       batch_size: int = Query(Config.NOTES_EXPORT_BATCH_SIZE,
+                                               ge=1, le=10_000),
+                       ctx=Depends(require_role("reader", "writer", "admin"))):
+
+    org = ctx["org"]
+    user = ctx["user"]
+
+    return StreamingResponse(note_svc.export_notes(org, user, batch_size),
+                             media_type="application/x-ndjson")
 
 
 @note_router.get("/{note_id}", response_model=NoteReadSchema)
@@ -42,7 +107,7 @@ async def get_note(request: Request, note_id: PydanticObjectId,
     org = ctx["org"]
     user = ctx["user"]
     note = await note_svc.get_note(org, user, note_id)
-    return note
+    return json_response(note_adapter, note)
 
 
 @note_router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
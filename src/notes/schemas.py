@@ -1,7 +1,8 @@
 from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from bson import ObjectId
 
+from src.core.config import Config
 from src.organizations.schemas import OrganizationMiniSchema
 from src.users.schemas import UserMiniSchema
 from src.utils.link_resolver import BaseService
@@ -14,6 +15,25 @@ class NoteCreateSchema(BaseModel):
     content: str
 
 
+class NoteBulkCreateSchema(BaseModel):
+    notes: list[NoteCreateSchema] = Field(
+        ..., min_length=1, max_length=Config.NOTES_BULK_MAX_ITEMS)
+
+
+class NoteBulkItemResultSchema(BaseModel):
+    index: int
+    id: str | None = Field(None, alias="_id")
+    error: str | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class NoteBulkResultSchema(BaseModel):
+    inserted: int
+    failed: int
+    results: list[NoteBulkItemResultSchema]
+
+
 class NoteReadSchema(BaseModel):
     id: str = Field(alias="_id", json_schema_extra={
                     "example": "652c1e6fcf9b7f001f3f5a2b"})
@@ -43,21 +63,52 @@ class NoteReadSchema(BaseModel):
         org_doc = await base_svc.resolve_link(org_attr)
 
         if org_doc:
-            data["org"] = OrganizationMiniSchema(
-                id=str(org_doc.id),
-                name=org_doc.name,
-                description=org_doc.description
-            )
+            data["org"] = OrganizationMiniSchema.from_document(org_doc)
 
         author_attr = getattr(note, "author", None)
         author_doc = await base_svc.resolve_link(author_attr)
 
         if author_doc:
-            data["author"] = UserMiniSchema(
-                id=str(author_doc.id),
-                email=author_doc.email,
-                full_name=author_doc.full_name,
-                role=author_doc.role,
-            )
+            data["author"] = UserMiniSchema.from_document(author_doc)
 
         return cls(**data)
+
+    @classmethod
+    def from_raw(cls, doc: dict,
+                 org: OrganizationMiniSchema, author: UserMiniSchema):
+        """Build from a raw Mongo document and its already serialized
+        links, without validation."""
+        return cls.model_construct(
+            id=str(doc["_id"]),
+            title=doc["title"],
+            content=doc["content"],
+            created_at=doc["created_at"],
+            org=org,
+            author=author,
+        )
+
+
+class NoteSummarySchema(BaseModel):
+    id: str = Field(alias="_id", json_schema_extra={
+                    "example": "652c1e6fcf9b7f001f3f5a2b"})
+    title: str
+    created_at: datetime
+    author: UserMiniSchema
+    score: float = Field(description="Text relevance score")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def from_raw(cls, doc: dict, author: UserMiniSchema):
+        return cls.model_construct(
+            id=str(doc["_id"]),
+            title=doc["title"],
+            created_at=doc["created_at"],
+            author=author,
+            score=doc["score"],
+        )
+
+
+note_adapter = TypeAdapter(NoteReadSchema)
+note_list_adapter = TypeAdapter(list[NoteReadSchema])
+note_summary_list_adapter = TypeAdapter(list[NoteSummarySchema])
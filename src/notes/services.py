@@ -1,65 +1,236 @@
+from typing import AsyncIterator
 from beanie import PydanticObjectId
-
-from src.utils.link_resolver import BaseService
-from src.notes.models import Note
-from src.notes.schemas import NoteCreateSchema, NoteReadSchema
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+from src.core.config import Config
+from src.db.routing import session_options
+from src.db.tenancy import to_db
+from src.utils.link_resolver import TenantScopedService, IdentityMap
+from src.notes.models import Note, OrgSnapshot, AuthorSnapshot
+from src.notes.coalescer import WriteCoalescer
+from src.notes.schemas import (
+    NoteCreateSchema, NoteReadSchema, NoteSummarySchema, note_adapter,
+    NoteBulkItemResultSchema, NoteBulkResultSchema
+)
+from src.organizations.schemas import OrganizationMiniSchema
+from src.users.schemas import UserMiniSchema
 from src.organizations.models import Organization
+from src.organizations.versions import bump_version
 from src.users.models import User
-from src.middlewares.errors import NoteNotFound, UnauthorizedAccess
+from src.middlewares.errors import NoteNotFound
+from src.utils.pagination import encode_cursor, decode_cursor, keyset_filter
 
+NOTE_SUMMARY_PROJECTION = {
+    "title": 1,
+    "created_at": 1,
+    "author": 1,
+    "author_snapshot": 1,
+    "score": {"$meta": "textScore"},
+}
 
-class NoteService(BaseService):
 
-    async def find_note(self, note_id):
-        note = await Note.get(note_id)
-        if not note:
-            raise NoteNotFound()
-        return note
+class NoteService(TenantScopedService):
+
+    document_model = Note
+
+    def __init__(self):
+        self.writes = WriteCoalescer()
 
     async def create_note(self,
                           org: Organization,
                           user: User,
                           data: NoteCreateSchema) -> NoteReadSchema:
 
-        note = Note(**data.model_dump(), org=org, author=user)
-        await note.insert()
+        note = Note(id=PydanticObjectId(), **data.model_dump(), org=org,
+                    author=user, **self.snapshots(org, user))
+        if Config.NOTES_WRITE_COALESCING:
+            await self.writes.insert(note, self.collection(org))
+        else:
+            await self.collection(org).insert_one(to_db(note),
+                                                  **session_options())
+        await bump_version(org.id, "notes")
         return await NoteReadSchema.from_mongo(note)
 
+    async def create_notes(self,
+                           org: Organization,
+                           user: User,
+                           items: list[NoteCreateSchema]
+                           ) -> NoteBulkResultSchema:
+        """Insert all items with one unordered insert_many; a failing item
+        does not stop the others and is reported by its index."""
+
+        snapshots = self.snapshots(org, user)
+        notes = [
+            Note(id=PydanticObjectId(), **item.model_dump(),
+                 org=org, author=user, **snapshots)
+            for item in items
+        ]
+
+        errors = {}
+        try:
+            await self.collection(org).insert_many(
+                [to_db(note) for note in notes], ordered=False,
+                **session_options())
+        except BulkWriteError as exc:
+            errors = {error["index"]: error["errmsg"]
+                      for error in exc.details.get("writeErrors", [])}
+        if len(errors) < len(notes):
+            await bump_version(org.id, "notes")
+
+        results = [
+            NoteBulkItemResultSchema(index=i, error=errors[i])
+            if i in errors else
+            NoteBulkItemResultSchema(index=i, id=str(note.id))
+            for i, note in enumerate(notes)
+        ]
+        return NoteBulkResultSchema(inserted=len(notes) - len(errors),
+                                    failed=len(errors), results=results)
+
+    @staticmethod
+    def snapshots(org: Organization, user: User) -> dict:
+        return {"org_snapshot": OrgSnapshot.from_document(org),
+                "author_snapshot": AuthorSnapshot.from_document(user)}
+
     async def list_notes(self,
                          org: Organization,
-                         _: User) -> list[NoteReadSchema]:
-
-        notes = await Note.find(Note.org.id == org.id).to_list()
-        return [await NoteReadSchema.from_mongo(note) for note in notes]
+                         _: User,
+                         limit: int,
+                         cursor: str | None = None
+                         ) -> tuple[list[NoteReadSchema], str | None]:
+        """Return one page of the organization's notes, newest first,
+        plus the cursor of the next page (None on the last page)."""
+
+        query = keyset_filter(*decode_cursor(cursor)) if cursor else None
+
+        notes = await (self.find_scoped(org, query)
+                       .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+                       .limit(limit + 1)
+                       .to_list(length=None))
+
+        next_cursor = None
+        if len(notes) > limit:
+            notes = notes[:limit]
+            next_cursor = encode_cursor(notes[-1]["created_at"], notes[-1]["_id"])
+
+        return await self.to_read_schemas(notes, IdentityMap(org)), next_cursor
+
+    async def to_read_schemas(self,
+                              notes: list[dict],
+                              docs: IdentityMap) -> list[NoteReadSchema]:
+        """Serialize raw note documents from their embedded snapshots.
+        Notes written before snapshots existed have their org and author
+        loaded with one query per model instead."""
+
+        legacy = [note for note in notes if not note.get("org_snapshot")]
+        await docs.load(Organization, (note["org"] for note in legacy))
+        authors = await self.load_authors(notes, docs)
+
+        return [
+            NoteReadSchema.from_raw(note, self.org_summary(note, docs),
+                                    authors[note["author"].id])
+            for note in notes
+        ]
+
+    @staticmethod
+    def org_summary(note: dict, docs: IdentityMap) -> OrganizationMiniSchema:
+        if note.get("org_snapshot"):
+            return OrganizationMiniSchema.from_snapshot(note["org"].id,
+                                                        note["org_snapshot"])
+        return OrganizationMiniSchema.from_document(
+            docs.get(Organization, note["org"]))
+
+    async def load_authors(self,
+                           notes: list[dict],
+                           docs: IdentityMap) -> dict:
+        """Map each distinct author id of `notes` to its summary schema,
+        from the embedded snapshot when there is one; the authors of
+        legacy notes are loaded in one query."""
+
+        authors = {
+            note["author"].id: UserMiniSchema.from_snapshot(
+                note["author"].id, note["author_snapshot"])
+            for note in notes if note.get("author_snapshot")
+        }
+        missing = [note["author"] for note in notes
+                   if note["author"].id not in authors]
+        await docs.load(User, missing)
+        for ref in missing:
+            authors[ref.id] = UserMiniSchema.from_document(docs.get(User, ref))
+        return authors
+
+    async def search_notes(self,
+                           org: Organization,
+                           _: User,
+                           q: str,
+                           limit: int,
+                           offset: int = 0) -> list[NoteSummarySchema]:
+        """Full-text search within the organization, best matches first."""
+
+        notes = await (self.find_scoped(org, {"$text": {"$search": q}},
+                                        NOTE_SUMMARY_PROJECTION)
+                       .sort([("score", {"$meta": "textScore"}),
+                              ("_id", DESCENDING)])
+                       .skip(offset)
+                       .limit(limit)
+                       .to_list(length=None))
+
+        authors = await self.load_authors(notes, IdentityMap(org))
+        return [
+            NoteSummarySchema.from_raw(note, authors[note["author"].id])
+            for note in notes
+        ]
+
+    async def export_notes(self,
+                           org: Organization,
+                           _: User,
+                           batch_size: int) -> AsyncIterator[bytes]:
+        """Yield the organization's notes as NDJSON, one chunk per cursor
+        batch, so memory use does not grow with the tenant's size."""
+
+        cursor = (self.find_scoped(org)
+                  .sort([("created_at", ASCENDING), ("_id", ASCENDING)])
+                  .batch_size(batch_size))
+        docs = IdentityMap(org)
+
+        batch = []
+        async for note in cursor:
+            batch.append(note)
+            if len(batch) >= batch_size:
+                yield await self.to_ndjson(batch, docs)
+                batch = []
+
+        if batch:
+            yield await self.to_ndjson(batch, docs)
+
+    async def to_ndjson(self, notes: list[dict], docs: IdentityMap) -> bytes:
+        schemas = await self.to_read_schemas(notes, docs)
+        return b"".join(
+            note_adapter.dump_json(schema, by_alias=True) + b"\n"
+            for schema in schemas
+        )
 
     async def get_note(self,
                        org: Organization,
-                       user: User,
-                       note_id: PydanticObjectId) -> Note:
-
-        note = await self.find_note(note_id)
-        user_org = await self.resolve_link(user.org)
-        note_org = await self.resolve_link(note.org)
+                       _: User,
+                       note_id: PydanticObjectId) -> NoteReadSchema:
 
-        if str(note_org.id) != str(org.id) or str(user_org.id) != str(org.id):
-            raise UnauthorizedAccess()
+        note = await self.find_one_scoped(org, {"_id": note_id})
+        if not note:
+            raise NoteNotFound()
 
-        return await NoteReadSchema.from_mongo(note)
+        [schema] = await self.to_read_schemas([note], IdentityMap(org))
+        return schema
 
     async def delete_note(self,
                           org: Organization,
-                          user: User,
+                          _: User,
                           note_id: PydanticObjectId):
 
-        note = await self.find_note(note_id)
-
-        user_org = await self.resolve_link(user.org)
-        note_org = await self.resolve_link(note.org)
-
-        if str(user_org.id) != str(note_org.id):
-            raise UnauthorizedAccess()
+        if not await self.delete_one_scoped(org, {"_id": note_id}):
+            raise NoteNotFound()
+        await bump_version(org.id, "notes")
 
-        await note.delete()
         return {"message": "Note deleted successfully"}
 
 
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+
+from src.core.config import Config
+from src.db.tenancy import namespaces, tenant_collection
+from src.notes.models import Note, OrgSnapshot, AuthorSnapshot
+from src.organizations.versions import bump_version
+from src.utils.link_resolver import link_id
+
+logger = logging.getLogger("multi-tenant-notes-api")
+
+
+class SnapshotRefresher:
+    """Fan changes of a user or organization out to the snapshots embedded
+    in their notes.
+
+    Changes are queued and applied by a background task, one batch of
+    note ids at a time, so a large tenant does not turn into one long
+    update. Repeated changes to the same document before the task gets to
+    it are coalesced into the latest snapshot.
+    """
+
+    def __init__(self, batch_size: int | None = None):
+        self.batch_size = batch_size or Config.NOTES_SNAPSHOT_BATCH_SIZE
+        self._pending: dict[tuple[str, object, object], dict] = {}
+        self._task: asyncio.Task | None = None
+
+    def refresh_author(self, user) -> None:
+        self.schedule("author", user.id, link_id(user.org),
+                      AuthorSnapshot.from_document(user).model_dump())
+
+    def refresh_org(self, org) -> None:
+        self.schedule("org", org.id, org.id,
+                      OrgSnapshot.from_document(org).model_dump())
+
+    def schedule(self, field: str, ref_id, org_id, snapshot: dict) -> None:
+        self._pending[(field, ref_id, org_id)] = snapshot
+
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self.drain())
+
+    async def drain(self) -> None:
+        while self._pending:
+            (field, ref_id, org_id), snapshot = self._pending.popitem()
+            try:
+                await self.apply(field, ref_id, org_id, snapshot)
+            except Exception:
+                logger.exception("Note snapshot refresh failed")
+
+    async def wait(self) -> None:
+        """Wait until every queued change has been applied."""
+        if self._task is not None:
+            await self._task
+
+    async def apply(self, field: str, ref_id, org_id, snapshot: dict) -> int:
+        """Write `snapshot` into every note of organization `org_id` whose
+        `field` link points at `ref_id` and does not carry it yet; returns
+        the notes updated."""
+        await namespaces.bind(org_id)
+        collection = tenant_collection(Note, org_id)
+        stale = {"org.$id": org_id, f"{field}.$id": ref_id,
+                 f"{field}_snapshot": {"$ne": snapshot}}
+
+        updated = 0
+        while True:
+            batch = await (collection.find(stale, {"_id": 1})
+                           .limit(self.batch_size)
+                           .to_list(length=None))
+            if not batch:
+                return updated
+
+            result = await collection.update_many(
+                {"_id": {"$in": [doc["_id"] for doc in batch]}},
+                {"$set": {f"{field}_snapshot": snapshot}})
+            if not result.modified_count:
+                return updated
+            updated += result.modified_count
+            await bump_version(org_id, "notes")
+
+
+snapshot_refresher = SnapshotRefresher()
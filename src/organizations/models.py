@@ -2,12 +2,19 @@ from datetime import datetime, timezone
 from beanie import Document, Indexed
 from pydantic import Field
 from typing import Annotated
+from src.core.config import Config, Isolation
 
 
 class Organization(Document):
 
     name: Annotated[str, Indexed(unique=True), Field(min_length=3)]
     description: str | None = None
+    tier: str = Field(default_factory=lambda: Config.QUOTA_DEFAULT_TIER)
+    # Where its users and notes live; see src.db.tenancy.
+    isolation: Isolation = Field(default_factory=lambda: Config.TENANT_ISOLATION)
+    # Bumped on every change to the organization's notes/users; see
+    # src.organizations.versions.
+    versions: dict[str, int] = Field(default_factory=dict)
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, status, Request
 from src.organizations.schemas import (
-    OrganizationCreateSchema, OrganizationReadSchema
+    OrganizationCreateSchema, OrganizationReadSchema, org_list_adapter
 )
 from src.organizations.services import org_svc
+from src.utils.serialization import json_response
 
 
 org_router = APIRouter()
@@ -18,4 +19,5 @@ async def create_organization(request: Request,
 @org_router.get("/", response_model=list[OrganizationReadSchema],
                 status_code=status.HTTP_200_OK)
 async def list_organizations(request: Request,):
-    return await org_svc.list_organizations()
+    orgs = await org_svc.list_organizations()
+    return json_response(org_list_adapter, orgs)
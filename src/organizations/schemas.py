@@ -1,6 +1,8 @@
 from datetime import datetime
 from bson import ObjectId
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+
+from src.core.config import Config
 
 
 class OrganizationCreateSchema(BaseModel):
@@ -14,6 +16,7 @@ class OrganizationReadSchema(BaseModel):
                     "example": "652c1e6fcf9b7f001f3f5a2b"})
     name: str
     description: str | None = None
+    tier: str
     created_at: datetime
 
     model_config = ConfigDict(
@@ -34,6 +37,18 @@ class OrganizationReadSchema(BaseModel):
             data["_id"] = str(data["_id"])
         return cls(**data)
 
+    @classmethod
+    def from_raw(cls, doc: dict):
+        """Build from a raw Mongo document without validation; the data
+        comes straight from our own collection."""
+        return cls.model_construct(
+            id=str(doc["_id"]),
+            name=doc["name"],
+            description=doc.get("description"),
+            tier=doc.get("tier", Config.QUOTA_DEFAULT_TIER),
+            created_at=doc["created_at"],
+        )
+
 
 class OrganizationMiniSchema(BaseModel):
     id: str = Field(alias="_id")
@@ -45,3 +60,16 @@ class OrganizationMiniSchema(BaseModel):
         arbitrary_types_allowed=True,
         json_encoders={ObjectId: str},
     )
+
+    @classmethod
+    def from_document(cls, org):
+        return cls.model_construct(id=str(org.id), name=org.name,
+                                   description=org.description)
+
+    @classmethod
+    def from_snapshot(cls, org_id, snapshot: dict):
+        return cls.model_construct(id=str(org_id), name=snapshot["name"],
+                                   description=snapshot.get("description"))
+
+
+org_list_adapter = TypeAdapter(list[OrganizationReadSchema])
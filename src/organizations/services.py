@@ -1,34 +1,30 @@
+from pymongo.errors import DuplicateKeyError
 from src.organizations.models import Organization
 from src.organizations.schemas import (
     OrganizationCreateSchema, OrganizationReadSchema
 )
 from src.middlewares.errors import OrganizationAlreadyExists
+from src.db.routing import read_collection, session_options
 
 
 class OrganizationService:
 
-    async def get_organization_by_name(self, name: str) -> Organization:
-        existing = await Organization.find_one(Organization.name == name)
-        if existing:
-            raise OrganizationAlreadyExists()
-        return None
-
     async def create_organization(
             self,
-            data: OrganizationCreateSchema) -> Organization:
+            data: OrganizationCreateSchema) -> OrganizationReadSchema:
 
-        existing = await self.get_organization_by_name(data.name)
-
-        if not existing:
-            org = Organization(**data.model_dump())
-            await org.insert()
-            return OrganizationReadSchema.from_mongo(org)
+        org = Organization(**data.model_dump())
+        try:
+            await org.insert(**session_options())
+        except DuplicateKeyError:
+            raise OrganizationAlreadyExists()
+        return OrganizationReadSchema.from_mongo(org)
 
-    async def list_organizations(self) -> list[Organization]:
-        orgs = await Organization.find_all().to_list()
-        return [
-            OrganizationReadSchema.from_mongo(org) for org in orgs
-        ]
+    async def list_organizations(self) -> list[OrganizationReadSchema]:
+        orgs = await (read_collection(Organization)
+                      .find(**session_options())
+                      .to_list(length=None))
+        return [OrganizationReadSchema.from_raw(org) for org in orgs]
 
 
 org_svc = OrganizationService()
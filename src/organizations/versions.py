@@ -0,0 +1,21 @@
+from src.db.routing import read_collection, session_options
+from src.organizations.models import Organization
+
+
+async def bump_version(org_id, collection: str) -> None:
+    """Record a change to one of the organization's collections (`notes`,
+    `users`), invalidating the ETags handed out for its lists."""
+    await Organization.get_pymongo_collection().update_one(
+        {"_id": org_id}, {"$inc": {f"versions.{collection}": 1}},
+        **session_options())
+
+
+async def collection_etag(org_id, collection: str) -> str | None:
+    """Weak ETag of the organization's `collection` lists, read without
+    loading the lists themselves; None if the organization is unknown."""
+    org = await read_collection(Organization).find_one(
+        {"_id": org_id}, {f"versions.{collection}": 1}, **session_options())
+    if org is None:
+        return None
+    version = org.get("versions", {}).get(collection, 0)
+    return f'W/"{collection}-{org_id}-{version}"'
@@ -11,8 +11,10 @@ from src.notes.models import Note
 
 from src.organizations.routes import org_router
 from src.users.routes import user_router
-from src.notes.routes import note_router
+from src.notes.routes import note_router, note_bulk_router
+from src.auth.routes import auth_router
 from src.core.config import Config
+from src.db.monitoring import command_monitor
 
 
 @pytest.fixture(scope="session")
@@ -30,10 +32,15 @@ async def app():
                        tags=["Organizations"])
     app.include_router(user_router, prefix="/organizations/{org_id}/users",
                        tags=["users"])
+    app.include_router(note_bulk_router, prefix="/notes",
+                       tags=["notes"])
     app.include_router(note_router, prefix="/notes",
                        tags=["notes"])
+    app.include_router(auth_router, prefix="/auth",
+                       tags=["auth"])
 
-    client = AsyncIOMotorClient(Config.MONGO_URI)
+    client = AsyncIOMotorClient(Config.MONGO_URI,
+                                event_listeners=[command_monitor])
     db = client["test_db"]
 
     await init_beanie(database=db, document_models=[Organization, User, Note])
@@ -46,7 +53,7 @@ async def app():
 
 
 @pytest.fixture(autouse=True)
-async def clear_db():
+async def clear_db(app: FastAPI):
 
     await Organization.delete_all()
     await User.delete_all()
@@ -61,3 +68,34 @@ async def client(app: FastAPI):
     async with AsyncClient(transport=transport,
                            base_url="http://testserver") as ac:
         yield ac
+
+
+class Tenant:
+    """An organization and one of its users, created through the API."""
+
+    def __init__(self, org: dict, user: dict):
+        self.org = org
+        self.user = user
+        self.headers = {"X-Org-ID": org["_id"], "X-User-ID": user["_id"]}
+
+
+@pytest.fixture
+def make_tenant(client: AsyncClient):
+    """Create an organization called `name` with one `role` user."""
+    async def make(name: str = "Test Org", role: str = "writer",
+                   description: str | None = None) -> Tenant:
+        org = (await client.post("/organizations/", json={
+            "name": name, "description": description})).json()
+        user = (await client.post(f"/organizations/{org['_id']}/users/", json={
+            "email": f"{role}@example.com", "full_name": f"Test {role.title()}",
+            "role": role})).json()
+        return Tenant(org, user)
+
+    return make
+
+
+@pytest.fixture
+async def tenant(request, make_tenant) -> Tenant:
+    """A writer of "Test Org"; parametrize it indirectly with make_tenant
+    keywords for another name or role."""
+    return await make_tenant(**getattr(request, "param", {}))
@@ -0,0 +1,65 @@
+import pytest
+from beanie import PydanticObjectId
+from httpx import AsyncClient
+
+from src.core.config import Config
+from src.users.models import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def token_secret(monkeypatch):
+    monkeypatch.setattr(Config, "TENANT_TOKEN_SECRET", "test-secret")
+
+
+async def test_issue_token_requires_secret(client: AsyncClient, tenant):
+    response = await client.post("/auth/token", headers=tenant.headers)
+
+    assert response.status_code == 503
+
+
+async def test_token_authenticates_requests(client: AsyncClient, token_secret,
+                                            tenant):
+    token_res = await client.post("/auth/token", headers=tenant.headers)
+    assert token_res.status_code == 201
+    token = token_res.json()["access_token"]
+
+    bearer = {"Authorization": f"Bearer {token}"}
+    note_res = await client.post("/notes/", headers=bearer, json={
+        "title": "Token Note", "content": "Created with a tenant token."})
+
+    data = note_res.json()
+    assert note_res.status_code == 201
+    assert data["author"]["email"] == tenant.user["email"]
+    assert data["org"]["name"] == tenant.org["name"]
+
+
+async def test_invalid_token_rejected(client: AsyncClient, token_secret):
+    response = await client.get(
+        "/notes/", headers={"Authorization": "Bearer not-a-token"})
+
+    assert response.status_code == 401
+    assert response.json()["error_code"] == "invalid_token"
+
+
+async def test_token_renewal_rereads_user(client: AsyncClient, token_secret,
+                                          tenant):
+    issued = await client.post("/auth/token", headers=tenant.headers)
+    token = issued.json()["access_token"]
+    bearer = {"Authorization": f"Bearer {token}"}
+
+    users = User.get_pymongo_collection()
+    await users.update_one({"_id": PydanticObjectId(tenant.user["_id"])},
+                           {"$set": {"role": "reader"}})
+    renewed = await client.post("/auth/token", headers=bearer)
+    assert renewed.status_code == 201
+
+    renewed_bearer = {"Authorization": f"Bearer {renewed.json()['access_token']}"}
+    note_res = await client.post("/notes/", headers=renewed_bearer, json={
+        "title": "Demoted", "content": "Readers cannot write."})
+    assert note_res.status_code == 403
+
+    await users.delete_one({"_id": PydanticObjectId(tenant.user["_id"])})
+    response = await client.post("/auth/token", headers=bearer)
+    assert response.status_code == 404
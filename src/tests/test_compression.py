@@ -0,0 +1,96 @@
+import zlib
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.config import Config
+from src.middlewares.compression import (
+    COMPRESSORS, CompressedResponse, compressed_cache
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def headers(client: AsyncClient, tenant) -> dict:
+    """The tenant's headers, once it has notes enough to compress."""
+    for i in range(5):
+        await client.post("/notes/", json={"title": f"Note {i}",
+                                           "content": "Lorem ipsum " * 50},
+                          headers=tenant.headers)
+    return tenant.headers
+
+
+async def test_lists_are_compressed_when_accepted(client: AsyncClient, headers):
+    response = await client.get("/notes/", headers={
+        **headers, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 5
+
+    identity = await client.get("/notes/", headers={
+        **headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == response.json()
+
+
+async def test_small_responses_are_not_compressed(client: AsyncClient, headers,
+                                                  monkeypatch):
+    monkeypatch.setattr(Config, "COMPRESSION_MIN_SIZE", 10**6)
+
+    response = await client.get("/notes/", headers={
+        **headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_repeated_polls_reuse_compressed_payload(client: AsyncClient,
+                                                       headers):
+    headers = {**headers, "Accept-Encoding": "gzip"}
+    compressed_cache.clear()
+
+    first = await client.get("/notes/", headers=headers)
+    hits = compressed_cache.hits
+    second = await client.get("/notes/", headers=headers)
+    assert compressed_cache.hits == hits + 1
+    assert second.content == first.content
+
+    await client.post("/notes/", json={"title": "New", "content": "Changed"},
+                      headers=headers)
+    third = await client.get("/notes/", headers=headers)
+    assert len(third.json()) == 6
+
+
+def decompressor(encoding: str):
+    """A decompress(data) callable for the incremental decoder of `encoding`."""
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == "br":
+        import brotli
+        return brotli.Decompressor().process
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+@pytest.mark.parametrize("encoding", sorted(COMPRESSORS))
+async def test_streamed_chunks_are_flushed(encoding: str):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    response = CompressedResponse({"type": "http"}, send, encoding)
+    await response.send({"type": "http.response.start", "status": 200,
+                         "headers": [(b"content-type", b"application/x-ndjson")]})
+
+    decompress = decompressor(encoding)
+    lines = [b'{"title": "Note %d"}\n' % i for i in range(3)]
+    for line in lines:
+        await response.send({"type": "http.response.body", "body": line,
+                             "more_body": True})
+        # Each line can be decoded as soon as it is sent.
+        assert decompress(sent[-1]["body"]) == line
+    await response.send({"type": "http.response.body", "body": b"",
+                         "more_body": False})
+
+    assert dict(sent[0]["headers"])[b"content-encoding"] == encoding.encode()
+    assert not sent[-1]["more_body"]
@@ -0,0 +1,43 @@
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("tenant", [{"role": "admin"}], indirect=True)
+async def test_unchanged_notes_answer_not_modified(client: AsyncClient, tenant):
+    headers = tenant.headers
+    created = await client.post("/notes/", json={"title": "One",
+                                                 "content": "First"},
+                                headers=headers)
+
+    first = await client.get("/notes/", headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"notes-')
+
+    again = await client.get("/notes/", headers={**headers,
+                                                 "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+    await client.delete(f"/notes/{created.json()['_id']}", headers=headers)
+    changed = await client.get("/notes/", headers={**headers,
+                                                   "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json() == []
+    assert changed.headers["etag"] != etag
+
+
+async def test_user_list_etag_changes_with_new_users(client: AsyncClient, tenant):
+    url = f"/organizations/{tenant.org['_id']}/users/"
+
+    etag = (await client.get(url)).headers["etag"]
+    assert (await client.get(url, headers={"If-None-Match": etag})
+            ).status_code == 304
+
+    await client.post(url, json={"email": "new@example.com",
+                                 "full_name": "New User", "role": "reader"})
+    changed = await client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
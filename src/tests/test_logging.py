@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.config import Config
+
+pytestmark = pytest.mark.anyio
+
+
+def access_records(caplog):
+    return [record.fields for record in caplog.records
+            if record.name == "multi-tenant-notes-api.access"]
+
+
+async def test_access_log_is_structured(client: AsyncClient, caplog):
+    org = (await client.post("/organizations/", json={"name": "Log Org"})).json()
+    user = (await client.post(f"/organizations/{org['_id']}/users/", json={
+        "email": "log@example.com",
+        "full_name": "Log Reader",
+        "role": "reader",
+    })).json()
+
+    caplog.set_level(logging.INFO)
+    caplog.clear()
+    response = await client.get("/notes/", headers={
+        "X-Org-ID": org["_id"], "X-User-ID": user["_id"]})
+
+    assert response.status_code == 200
+    [entry] = access_records(caplog)
+    assert entry["method"] == "GET"
+    assert entry["route"] == "/notes/"
+    assert entry["status"] == 200
+    assert entry["org_id"] == org["_id"]
+    assert entry["duration_ms"] >= 0
+    assert isinstance(entry["db_calls"], int)
+
+
+async def test_successes_are_sampled_errors_are_not(client: AsyncClient,
+                                                    caplog, monkeypatch):
+    monkeypatch.setattr(Config, "LOG_SUCCESS_SAMPLE_RATE", 0.0)
+    caplog.set_level(logging.INFO)
+
+    await client.get("/organizations/")
+    await client.get("/notes/")
+
+    assert [entry["status"] for entry in access_records(caplog)] == [400]
@@ -0,0 +1,65 @@
+import pytest
+from beanie import PydanticObjectId
+from httpx import AsyncClient
+
+from src.db.set_tier import set_tier
+from src.organizations.models import Organization
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_exposes_route_latency(client: AsyncClient):
+    await client.post("/organizations/", json={"name": "Metrics Org"})
+
+    await client.get("/organizations/")
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert ('http_request_duration_seconds_count{method="GET",'
+            'route="/organizations/",status="200"}') in body
+    assert "http_requests_in_flight" in body
+    assert "mongodb_command_duration_seconds" in body
+
+
+async def test_quota_rejections_are_counted(client: AsyncClient):
+    org = (await client.post("/organizations/", json={
+        "name": "Metrics Free Org"})).json()
+    await set_tier(Organization.get_pymongo_collection().database,
+                   PydanticObjectId(org["_id"]), "free")
+    writer = (await client.post(f"/organizations/{org['_id']}/users/", json={
+        "email": "metrics@example.com",
+        "full_name": "Metrics Writer",
+        "role": "writer",
+    })).json()
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": writer["_id"]}
+
+    for i in range(25):
+        await client.post("/notes/", headers=headers, json={
+            "title": f"Metrics {i}", "content": "Counting rejections."})
+
+    body = (await client.get("/metrics")).text
+    assert ('rate_limit_rejections_total{limiter="quota",'
+            'route="/notes/"}') in body
+
+
+async def test_tenant_cache_lookups_are_exported(client: AsyncClient):
+    org = (await client.post("/organizations/", json={
+        "name": "Metrics Cached Org"})).json()
+    reader = (await client.post(f"/organizations/{org['_id']}/users/", json={
+        "email": "cached@example.com",
+        "full_name": "Cached Reader",
+        "role": "reader",
+    })).json()
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": reader["_id"]}
+
+    for _ in range(2):
+        await client.get("/notes/", headers=headers)
+    body = (await client.get("/metrics")).text
+
+    samples = {line.split(" ")[0]: float(line.split(" ")[1])
+               for line in body.splitlines() if line.startswith("cache_")}
+    assert samples['cache_lookups_total{cache="tenant",result="hit"}'] >= 1
+    assert samples['cache_lookups_total{cache="tenant",result="miss"}'] >= 1
+    assert samples['cache_entries{cache="tenant"}'] >= 1
@@ -1,5 +1,17 @@
+import asyncio
+import json
 import pytest
+from beanie import PydanticObjectId
 from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from pymongo.errors import DuplicateKeyError
+
+from src.core.config import Config
+from src.notes.coalescer import WriteCoalescer
+from src.notes.models import Note
+from src.notes.services import note_svc
+from src.notes.snapshots import snapshot_refresher
+from src.users.models import User
 
 pytestmark = pytest.mark.anyio
 
@@ -188,5 +200,276 @@ async def test_cross_organization_access_denied(client: AsyncClient):
     }
 
     cross_res = await client.get(f"/notes/{note_id}", headers=headers_b)
-    assert cross_res.status_code == 401
-    assert "Unauthorized access" in cross_res.text
+    assert cross_res.status_code == 404
+    assert "Note not found" in cross_res.text
+
+
+async def test_list_notes_paginates_with_cursor(client: AsyncClient):
+    org, writer, _, _ = await setup_org_and_users(client)
+
+    headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": writer["_id"],
+    }
+
+    for i in range(3):
+        await client.post(
+            "/notes/",
+            json={"title": f"Page Note {i}", "content": "Paginated"},
+            headers=headers,
+        )
+
+    first = await client.get("/notes/", params={"limit": 2}, headers=headers)
+    cursor = first.headers.get("X-Next-Cursor")
+
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    assert cursor
+
+    second = await client.get(
+        "/notes/", params={"limit": 2, "cursor": cursor}, headers=headers
+    )
+    titles = {n["title"] for n in first.json() + second.json()}
+
+    assert second.status_code == 200
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    assert titles == {"Page Note 0", "Page Note 1", "Page Note 2"}
+
+
+async def test_list_notes_rejects_invalid_cursor(client: AsyncClient):
+    org, _, reader, _ = await setup_org_and_users(client)
+
+    headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": reader["_id"],
+    }
+
+    response = await client.get(
+        "/notes/", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "invalid_cursor"
+
+
+async def test_export_notes_streams_ndjson(client: AsyncClient):
+    org, writer, reader, _ = await setup_org_and_users(client)
+
+    writer_headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": writer["_id"],
+    }
+    reader_headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": reader["_id"],
+    }
+
+    for i in range(3):
+        await client.post(
+            "/notes/",
+            json={"title": f"Export {i}", "content": "Exported"},
+            headers=writer_headers,
+        )
+
+    response = await client.get(
+        "/notes/export", params={"batch_size": 2}, headers=reader_headers
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [n["title"] for n in lines] == ["Export 0", "Export 1", "Export 2"]
+    assert all(n["author"]["email"] == writer["email"] for n in lines)
+
+
+async def test_search_notes_is_scoped_and_ranked(client: AsyncClient):
+    org, writer, reader, _ = await setup_org_and_users(client)
+
+    writer_headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": writer["_id"],
+    }
+    reader_headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": reader["_id"],
+    }
+
+    notes = [
+        {"title": "Budget review", "content": "Quarterly numbers."},
+        {"title": "Team offsite", "content": "Agenda includes the budget."},
+        {"title": "Hiring plan", "content": "Open roles for next year."},
+    ]
+    for payload in notes:
+        await client.post("/notes/", json=payload, headers=writer_headers)
+
+    response = await client.get(
+        "/notes/search", params={"q": "budget"}, headers=reader_headers
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert [n["title"] for n in data] == ["Budget review", "Team offsite"]
+    assert all("content" not in n for n in data)
+    assert data[0]["author"]["email"] == writer["email"]
+
+
+async def test_bulk_create_notes(client: AsyncClient):
+    org, writer, reader, _ = await setup_org_and_users(client)
+
+    writer_headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": writer["_id"],
+    }
+    reader_headers = {
+        "X-Org-ID": org["_id"],
+        "X-User-ID": reader["_id"],
+    }
+    payload = {"notes": [
+        {"title": f"Bulk {i}", "content": "Ingested"} for i in range(3)
+    ]}
+
+    response = await client.post("/notes/bulk", json=payload,
+                                 headers=writer_headers)
+    data = response.json()
+
+    assert response.status_code == 201
+    assert data["inserted"] == 3
+    assert data["failed"] == 0
+    assert [r["index"] for r in data["results"]] == [0, 1, 2]
+    assert all(r["_id"] for r in data["results"])
+
+    listed = await client.get("/notes/", headers=reader_headers)
+    assert len(listed.json()) == 3
+
+    denied = await client.post("/notes/bulk", json=payload,
+                               headers=reader_headers)
+    assert denied.status_code == 403
+
+
+async def test_concurrent_creates_share_one_insert(client: AsyncClient,
+                                                   monkeypatch):
+    org, writer, reader, _ = await setup_org_and_users(client)
+    monkeypatch.setattr(Config, "NOTES_WRITE_COALESCING", True)
+    monkeypatch.setattr(note_svc.writes, "window", 0.05)
+
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": writer["_id"]}
+    batches = REGISTRY.get_sample_value("note_write_batch_size_count") or 0
+
+    responses = await asyncio.gather(*(
+        client.post("/notes/", json={"title": f"Peak {i}", "content": "x"},
+                    headers=headers)
+        for i in range(5)
+    ))
+
+    assert [r.status_code for r in responses] == [201] * 5
+    assert len({r.json()["_id"] for r in responses}) == 5
+    assert REGISTRY.get_sample_value("note_write_batch_size_count") == batches + 1
+
+    listed = await client.get("/notes/", headers={
+        "X-Org-ID": org["_id"], "X-User-ID": reader["_id"]})
+    assert len(listed.json()) == 5
+
+
+async def test_coalesced_insert_failures_are_per_caller(client: AsyncClient):
+    org, writer, _, _ = await setup_org_and_users(client)
+    user = await User.get(PydanticObjectId(writer["_id"]))
+    note_id = PydanticObjectId()
+    first, duplicate = (
+        Note(id=note_id, title=title, content="x", org=user.org, author=user)
+        for title in ("First", "Duplicate")
+    )
+
+    collection = Note.get_pymongo_collection()
+    writes = WriteCoalescer(batch_size=2, window=1)
+    results = await asyncio.gather(writes.insert(first, collection),
+                                   writes.insert(duplicate, collection),
+                                   return_exceptions=True)
+
+    assert results[0] is None
+    assert isinstance(results[1], DuplicateKeyError)
+    assert (await Note.get(note_id)).title == "First"
+
+
+async def test_cross_organization_delete_not_found(client: AsyncClient):
+    org_a, writer_a, _, _ = await setup_org_and_users(client)
+
+    headers_a = {
+        "X-Org-ID": org_a["_id"],
+        "X-User-ID": writer_a["_id"],
+    }
+    note_res = await client.post(
+        "/notes/",
+        json={"title": "Keep Me", "content": "Owned by Org A."},
+        headers=headers_a,
+    )
+    note_id = note_res.json()["_id"]
+
+    org_b_res = await client.post("/organizations/", json={"name": "Org B"})
+    org_b_id = org_b_res.json()["_id"]
+    admin_b_res = await client.post(
+        f"/organizations/{org_b_id}/users/",
+        json={"email": "admin-b@example.com", "full_name": "Admin B",
+              "role": "admin"},
+    )
+    headers_b = {
+        "X-Org-ID": org_b_id,
+        "X-User-ID": admin_b_res.json()["_id"],
+    }
+
+    delete_res = await client.delete(f"/notes/{note_id}", headers=headers_b)
+    assert delete_res.status_code == 404
+
+    get_res = await client.get(f"/notes/{note_id}", headers=headers_a)
+    assert get_res.status_code == 200
+
+
+async def test_notes_embed_org_and_author_snapshots(client: AsyncClient):
+    org, writer, _, _ = await setup_org_and_users(client)
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": writer["_id"]}
+
+    created = await client.post("/notes/", headers=headers, json={
+        "title": "Snapshot", "content": "Carries its author."})
+
+    raw = await Note.get_pymongo_collection().find_one(
+        {"_id": PydanticObjectId(created.json()["_id"])})
+    assert raw["author_snapshot"] == {"email": "writer@example.com",
+                                      "full_name": "Writer User",
+                                      "role": "writer"}
+    assert raw["org_snapshot"] == {"name": "Note Org",
+                                   "description": "For note tests"}
+
+
+async def test_user_change_is_fanned_out_to_notes(client: AsyncClient):
+    org, writer, _, _ = await setup_org_and_users(client)
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": writer["_id"]}
+    for i in range(3):
+        await client.post("/notes/", headers=headers, json={
+            "title": f"Fan-out {i}", "content": "Renamed author."})
+
+    user = await User.get(PydanticObjectId(writer["_id"]))
+    user.full_name = "Renamed Writer"
+    await user.save()
+    snapshot_refresher.refresh_author(user)
+    await snapshot_refresher.wait()
+
+    response = await client.get("/notes/", headers=headers)
+    assert {note["author"]["full_name"] for note in response.json()} == {
+        "Renamed Writer"}
+
+
+async def test_notes_without_snapshots_are_still_served(client: AsyncClient):
+    org, writer, _, _ = await setup_org_and_users(client)
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": writer["_id"]}
+    created = await client.post("/notes/", headers=headers, json={
+        "title": "Legacy", "content": "Written before snapshots."})
+    await Note.get_pymongo_collection().update_one(
+        {"_id": PydanticObjectId(created.json()["_id"])},
+        {"$unset": {"org_snapshot": "", "author_snapshot": ""}})
+
+    response = await client.get(f"/notes/{created.json()['_id']}",
+                                headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["author"]["full_name"] == "Writer User"
+    assert response.json()["org"]["name"] == "Note Org"
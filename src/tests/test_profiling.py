@@ -0,0 +1,65 @@
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.config import Config
+from src.middlewares.profiling import set_up_profiling
+from src.organizations.models import Organization
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_note_listing_has_no_n_plus_one(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(Config, "QUERY_PROFILER_ENABLED", True)
+
+    org = (await client.post("/organizations/",
+                             json={"name": "Profiled Org"})).json()
+    for i in range(4):
+        writer = (await client.post(f"/organizations/{org['_id']}/users/", json={
+            "email": f"profiled-{i}@example.com",
+            "full_name": f"Writer {i}",
+            "role": "writer",
+        })).json()
+        await client.post("/notes/", headers={
+            "X-Org-ID": org["_id"], "X-User-ID": writer["_id"]},
+            json={"title": f"Note {i}", "content": "Profiled."})
+
+    response = await client.get("/notes/", headers={
+        "X-Org-ID": org["_id"], "X-User-ID": writer["_id"]})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert "n-plus-one" not in timing
+
+
+async def test_repeated_query_shapes_are_flagged(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(Config, "QUERY_PROFILER_ENABLED", True)
+    monkeypatch.setattr(Config, "QUERY_PROFILER_REPEAT_THRESHOLD", 3)
+
+    app = FastAPI()
+    set_up_profiling(app)
+
+    @app.get("/one-by-one")
+    async def one_by_one():
+        # What an N+1 looks like: the same lookup issued once per item.
+        for _ in range(4):
+            await Organization.get_pymongo_collection().find_one(
+                {"_id": ObjectId()})
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=app),
+                           base_url="http://testserver") as profiled:
+        response = await profiled.get("/one-by-one")
+
+    timing = response.headers["Server-Timing"]
+    assert 'desc="4 queries"' in timing
+    assert 'n-plus-one;desc="1 repeated shapes"' in timing
+
+
+async def test_server_timing_off_by_default(client: AsyncClient):
+    response = await client.get("/organizations/")
+
+    assert "Server-Timing" not in response.headers
@@ -0,0 +1,89 @@
+import pytest
+from beanie import PydanticObjectId
+from httpx import AsyncClient
+
+from src.core.config import Config
+from src.db.set_tier import set_tier
+from src.dependencies.quota import QuotaManager
+from src.organizations.models import Organization
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_rate_limit_headers_on_tenant_routes(client: AsyncClient, tenant):
+    response = await client.get("/notes/", headers=tenant.headers)
+
+    assert response.status_code == 200
+    assert int(response.headers["X-RateLimit-Limit"]) > 0
+    assert "X-RateLimit-Remaining" in response.headers
+    assert "X-RateLimit-Reset" in response.headers
+
+
+async def test_free_tier_write_budget_is_enforced(client: AsyncClient, tenant):
+    db = Organization.get_pymongo_collection().database
+    assert await set_tier(db, PydanticObjectId(tenant.org["_id"]), "free")
+
+    statuses = []
+    for i in range(25):
+        response = await client.post("/notes/", headers=tenant.headers, json={
+            "title": f"Quota {i}", "content": "Counting writes."})
+        statuses.append(response.status_code)
+        if response.status_code == 429:
+            assert response.json()["error_code"] == "quota_exceeded"
+            assert int(response.headers["Retry-After"]) >= 1
+            assert response.headers["X-RateLimit-Remaining"] == "0"
+
+    assert 429 in statuses
+
+    reads = await client.get("/notes/", headers=tenant.headers)
+    assert reads.status_code == 200
+
+
+async def test_tier_cannot_be_chosen_on_creation(client: AsyncClient):
+    response = await client.post("/organizations/", json={
+        "name": "Enterprise Org", "tier": "enterprise"})
+
+    assert response.status_code == 201
+    assert response.json()["tier"] == "standard"
+
+
+async def test_unknown_tier_rejected(client: AsyncClient):
+    org = (await client.post("/organizations/", json={
+        "name": "Platinum Org"})).json()
+    db = Organization.get_pymongo_collection().database
+
+    with pytest.raises(ValueError):
+        await set_tier(db, PydanticObjectId(org["_id"]), "platinum")
+
+
+async def test_new_organizations_sync_without_reloading_the_others(
+        client: AsyncClient):
+    db = Organization.get_pymongo_collection().database
+    org_ids = [(await client.post("/organizations/", json={
+        "name": f"Synced Org {i}"})).json()["_id"] for i in range(3)]
+    now = [0.0]
+    manager = QuotaManager(timer=lambda: now[0], maxsize=2, idle_seconds=300)
+
+    async def consume(org_id):
+        _, bucket = manager.consume(org_id, "write")
+        await manager._sync_task
+        return bucket
+
+    await consume(org_ids[0])
+    assert await set_tier(db, PydanticObjectId(org_ids[0]), "free")
+    await consume(org_ids[1])
+    # Only the new organization was loaded: the first keeps its tier...
+    assert manager.orgs.peek(org_ids[0]).tier == "standard"
+
+    now[0] = Config.QUOTA_SYNC_SECONDS
+    await consume(org_ids[0])
+    # ...until the periodic reload.
+    assert manager.orgs.peek(org_ids[0]).tier == "free"
+    assert (await consume(org_ids[0])).capacity == Config.QUOTA_TIERS[
+        "free"].write_burst
+
+    await consume(org_ids[2])
+    assert sorted(manager.orgs.keys()) == sorted([org_ids[0], org_ids[2]])
+
+    now[0] += 301
+    assert manager.orgs.keys() == []
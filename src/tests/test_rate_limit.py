@@ -0,0 +1,59 @@
+import pytest
+from bson import ObjectId
+from starlette.requests import Request
+
+from src.auth.services import token_svc
+from src.core.config import Config
+from src.middlewares.rate_limit import get_org_key, get_user_key, storage_options
+from src.organizations.models import Organization
+from src.users.models import User
+
+pytestmark = pytest.mark.anyio
+
+
+def make_request(headers: dict) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/notes/",
+        "client": ("203.0.113.7", 4321),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+async def test_raw_tenant_headers_are_keyed_by_address():
+    for _ in range(3):
+        request = make_request({"X-Org-ID": str(ObjectId()),
+                                "X-User-ID": str(ObjectId())})
+        assert get_user_key(request) == "ip:203.0.113.7"
+        assert get_org_key(request) == "ip:203.0.113.7"
+
+
+async def test_verified_token_is_keyed_by_tenant(monkeypatch):
+    monkeypatch.setattr(Config, "TENANT_TOKEN_SECRET", "test-secret")
+    org = Organization.model_construct(id=ObjectId(), name="Limited Org")
+    user = User.model_construct(id=ObjectId(), email="limited@example.com",
+                                full_name="Limited", role="reader", org=org)
+    token = token_svc.issue_token(org, user, "reader").access_token
+
+    request = make_request({"Authorization": f"Bearer {token}"})
+
+    assert get_user_key(request) == f"user:{org.id}:{user.id}"
+    assert get_org_key(request) == f"org:{org.id}"
+
+
+@pytest.mark.parametrize("authorization", ["Bearer forged", "Basic abc"])
+async def test_invalid_credentials_are_keyed_by_address(monkeypatch, authorization):
+    monkeypatch.setattr(Config, "TENANT_TOKEN_SECRET", "test-secret")
+
+    request = make_request({"Authorization": authorization})
+
+    assert get_user_key(request) == "ip:203.0.113.7"
+
+
+async def test_shared_storage_round_trips_are_bounded(monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_STORAGE_TIMEOUT_MS", 150)
+
+    assert storage_options("mongodb://mongo:27017") == {
+        "serverSelectionTimeoutMS": 150, "connectTimeoutMS": 150,
+        "socketTimeoutMS": 150}
+    assert storage_options("redis://cache:6379")["socket_timeout"] == 0.15
+    assert storage_options("memory://") == {}
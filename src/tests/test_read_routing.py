@@ -0,0 +1,109 @@
+import bson
+import pytest
+from bson import Timestamp
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from src.core.config import Config, Settings
+from src.db.routing import (
+    apply_causal_token, b64encode, cluster_clock, encode_causal_token,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_reads_follow_writes_with_read_routing(client: AsyncClient,
+                                                     monkeypatch):
+    monkeypatch.setattr(Config, "READ_ROUTING_PREFERENCE", "secondaryPreferred")
+    monkeypatch.setattr(Config, "READ_ROUTING_OVERRIDES",
+                        {"GET /notes/{note_id}": "primary"})
+    monkeypatch.setattr(Config, "CAUSAL_TOKEN_SECRET", "test-secret")
+
+    org = (await client.post("/organizations/",
+                             json={"name": "Routed Org"})).json()
+    writer = (await client.post(f"/organizations/{org['_id']}/users/", json={
+        "email": "routed@example.com",
+        "full_name": "Routed Writer",
+        "role": "writer",
+    })).json()
+    headers = {"X-Org-ID": org["_id"], "X-User-ID": writer["_id"]}
+
+    created = await client.post("/notes/", headers=headers, json={
+        "title": "Routed", "content": "Read back through a session."})
+    assert created.status_code == 201
+
+    # Replica sets answer with a causal token; standalone servers do not.
+    token = created.headers.get("X-Causal-Token")
+    if token:
+        headers["X-Causal-Token"] = token
+
+    listed = await client.get("/notes/", headers=headers)
+    fetched = await client.get(f"/notes/{created.json()['_id']}",
+                               headers=headers)
+
+    assert [note["_id"] for note in listed.json()] == [created.json()["_id"]]
+    assert fetched.status_code == 200
+
+
+async def test_no_causal_token_without_read_routing(client: AsyncClient):
+    response = await client.get("/organizations/")
+
+    assert "X-Causal-Token" not in response.headers
+
+
+class FakeSession:
+    def __init__(self, operation_time=None, cluster_time=None):
+        self.operation_time = operation_time
+        self.cluster_time = cluster_time
+
+    def advance_operation_time(self, operation_time):
+        if self.operation_time is None or operation_time > self.operation_time:
+            self.operation_time = operation_time
+
+
+async def test_causal_token_carries_signed_operation_time(monkeypatch):
+    monkeypatch.setattr(Config, "CAUSAL_TOKEN_SECRET", "test-secret")
+    monkeypatch.setattr(cluster_clock, "latest", None)
+    token = encode_causal_token(FakeSession(
+        Timestamp(1700000000, 3),
+        {"clusterTime": Timestamp(1700000000, 5), "signature": {}}))
+
+    later = FakeSession()
+    assert apply_causal_token(later, token)
+    assert later.operation_time == Timestamp(1700000000, 3)
+    # Only the operation time travels; the cluster time stays the server's.
+    assert later.cluster_time is None
+
+
+async def test_forged_causal_tokens_are_ignored(monkeypatch):
+    monkeypatch.setattr(Config, "CAUSAL_TOKEN_SECRET", "test-secret")
+    token = encode_causal_token(FakeSession(Timestamp(1700000000, 3)))
+    payload, _, mac = token.partition(".")
+    forged = b64encode(bson.encode({"operationTime": Timestamp(1900000000, 1)}))
+
+    for candidate in (f"{forged}.{mac}", payload, "not-a-token"):
+        session = FakeSession()
+        assert not apply_causal_token(session, candidate)
+        assert session.operation_time is None
+
+    monkeypatch.setattr(Config, "CAUSAL_TOKEN_SECRET", "rotated-secret")
+    assert not apply_causal_token(FakeSession(), token)
+
+
+async def test_causal_token_is_clamped_to_known_cluster_time(monkeypatch):
+    monkeypatch.setattr(Config, "CAUSAL_TOKEN_SECRET", "test-secret")
+    monkeypatch.setattr(cluster_clock, "latest", Timestamp(1700000000, 1))
+    token = encode_causal_token(FakeSession(Timestamp(1800000000, 1)))
+
+    session = FakeSession()
+    assert apply_causal_token(session, token)
+    assert session.operation_time == Timestamp(1700000000, 1)
+
+
+async def test_max_staleness_below_driver_minimum_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings(MONGO_URI="mongodb://localhost", DB_NAME="db",
+                 READ_ROUTING_MAX_STALENESS_SECONDS=30)
+
+    assert Settings(MONGO_URI="mongodb://localhost", DB_NAME="db",
+                    READ_ROUTING_MAX_STALENESS_SECONDS=90)
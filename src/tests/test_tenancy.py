@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId
+from bson import ObjectId
+from httpx import AsyncClient
+
+from src.core.config import Config
+from src.db.migrations import sync_indexes
+from src.db.move_tenant import drain_documents, move_tenant
+from src.db.tenancy import namespaces, tenant_collection
+from src.notes.models import Note
+from src.users.models import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def with_note(client: AsyncClient, tenant):
+    """Give `tenant` a note; its organization id and headers."""
+    note = await client.post("/notes/", json={"title": "Kept apart",
+                                              "content": "Own namespace"},
+                             headers=tenant.headers)
+    assert note.status_code == 201
+    return PydanticObjectId(tenant.org["_id"]), tenant.headers
+
+
+async def test_database_isolation_keeps_tenant_out_of_shared_collections(
+        client: AsyncClient, make_tenant, monkeypatch):
+    monkeypatch.setattr(Config, "TENANT_ISOLATION", "database")
+    org_id, headers = await with_note(client, await make_tenant("Isolated Org"))
+
+    shared = Note.get_pymongo_collection()
+    own = shared.database.client[f"{shared.database.name}_{org_id}"]
+    assert await shared.count_documents({"org.$id": org_id}) == 0
+    assert await own["notes"].count_documents({"org.$id": org_id}) == 1
+    assert await own["users"].count_documents({"org.$id": org_id}) == 1
+
+    listed = await client.get("/notes/", headers=headers)
+    assert [n["title"] for n in listed.json()] == ["Kept apart"]
+
+
+async def test_move_tenant_to_own_collections(client: AsyncClient, make_tenant):
+    org_id, headers = await with_note(client, await make_tenant("Moving Org"))
+    db = Note.get_pymongo_collection().database
+
+    result = await move_tenant(db, org_id, "collection",
+                               batch_size=1, settle_seconds=0)
+    assert result["copied"] == {"users": 1, "notes": 1}
+    assert result["deleted"] == {"users": 1, "notes": 1}
+    assert await User.get_pymongo_collection().count_documents(
+        {"org.$id": org_id}) == 0
+    assert await db[f"notes_{org_id}"].count_documents({}) == 1
+
+    namespaces.forget(org_id)
+    listed = await client.get("/notes/", headers=headers)
+    assert [n["title"] for n in listed.json()] == ["Kept apart"]
+
+
+async def test_move_tenant_keeps_late_and_newer_writes(
+        client: AsyncClient, make_tenant, monkeypatch):
+    org_id, headers = await with_note(client, await make_tenant("Busy Org"))
+    db = Note.get_pymongo_collection().database
+    target = db[f"notes_{org_id}"]
+
+    async def settle(seconds):
+        # A worker still bound to the shared namespace accepts a note...
+        late = await client.post("/notes/", headers=headers, json={
+            "title": "Late", "content": "Written before the switch was seen"})
+        assert late.status_code == 201
+        # ...while one already on the new namespace changes a copied one.
+        await target.update_one({"title": "Kept apart"},
+                                {"$set": {"content": "Changed after the switch"}})
+
+    monkeypatch.setattr("src.db.move_tenant.settle", settle)
+    result = await move_tenant(db, org_id, "collection",
+                               batch_size=1, settle_seconds=0)
+
+    assert result["resynced"]["notes"] == 1
+    assert result["deleted"]["notes"] == 2
+    assert await Note.get_pymongo_collection().count_documents(
+        {"org.$id": org_id}) == 0
+    notes = {n["title"]: n["content"] async for n in target.find({})}
+    assert notes == {"Kept apart": "Changed after the switch",
+                     "Late": "Written before the switch was seen"}
+
+
+async def test_drain_keeps_writes_landing_between_copy_and_delete(
+        client: AsyncClient, make_tenant):
+    org_id, _ = await with_note(client, await make_tenant("Draining Org"))
+    source = Note.get_pymongo_collection()
+    target = source.database[f"notes_{org_id}"]
+    late = {**await source.find_one({"org.$id": org_id}),
+            "_id": ObjectId(), "title": "Late"}
+
+    class WriteDuringCopy:
+        """`target`, with a write landing in the source as it is copied to."""
+
+        def __init__(self):
+            self.pending = late
+
+        async def bulk_write(self, requests, **kwargs):
+            if self.pending is not None:
+                await source.insert_one(self.pending)
+                self.pending = None
+            return await target.bulk_write(requests, **kwargs)
+
+    inserted, deleted = await drain_documents(source, WriteDuringCopy(),
+                                              org_id, batch_size=10)
+
+    assert (inserted, deleted) == (2, 2)
+    assert await source.count_documents({"org.$id": org_id}) == 0
+    assert sorted([n["title"] async for n in target.find({})]) == [
+        "Kept apart", "Late"]
+
+
+async def test_bound_namespace_survives_eviction(client: AsyncClient, make_tenant,
+                                                 monkeypatch):
+    monkeypatch.setattr(Config, "TENANT_ISOLATION", "database")
+    org_id, _ = await with_note(client, await make_tenant("Evicted Org"))
+    other_id, _ = await with_note(client, await make_tenant("Evicting Org"))
+    monkeypatch.setattr(namespaces, "maxsize", 1)
+
+    await namespaces.bind(org_id)
+    # A concurrent request binding another organization evicts this one.
+    namespaces.forget(other_id)
+    await asyncio.create_task(namespaces.bind(other_id))
+    assert namespaces.lookup(org_id) is None
+
+    notes = tenant_collection(Note, org_id)
+    assert await notes.count_documents({"org.$id": org_id}) == 1
+
+
+async def test_isolated_indexes_are_left_to_sync_indexes(
+        client: AsyncClient, make_tenant, monkeypatch):
+    monkeypatch.setattr(Config, "TENANT_ISOLATION", "collection")
+    monkeypatch.setattr(Config, "SKIP_INDEX_SYNC", True)
+    org_id, _ = await with_note(client, await make_tenant("Deferred Org"))
+    db = Note.get_pymongo_collection().database
+    own = db[f"notes_{org_id}"]
+    assert list(await own.index_information()) == ["_id_"]
+
+    indexes = await sync_indexes(db)
+
+    assert indexes[own.full_name] == sorted(await own.index_information())
+    assert len(indexes[own.full_name]) > 1
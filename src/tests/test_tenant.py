@@ -0,0 +1,70 @@
+import pytest
+from httpx import AsyncClient
+
+from src.dependencies.tenant import tenant_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_tenant_context_is_cached(client: AsyncClient, tenant):
+    org_id, user_id = tenant.org["_id"], tenant.user["_id"]
+    headers = {"X-Org-ID": org_id, "X-User-ID": user_id}
+
+    await client.get("/notes/", headers=headers)
+    hits = tenant_cache.hits
+
+    response = await client.get("/notes/", headers=headers)
+
+    assert response.status_code == 200
+    assert tenant_cache.hits == hits + 1
+
+
+async def test_create_user_invalidates_tenant_cache(client: AsyncClient, tenant):
+    org_id, user_id = tenant.org["_id"], tenant.user["_id"]
+    headers = {"X-Org-ID": org_id, "X-User-ID": user_id}
+
+    await client.get("/notes/", headers=headers)
+    assert tenant_cache.get((org_id, user_id)) is not None
+
+    await client.post(f"/organizations/{org_id}/users/", json={
+        "email": "another@example.com",
+        "full_name": "Another User",
+    })
+
+    assert tenant_cache.get((org_id, user_id)) is None
+
+
+async def test_cache_key_is_canonical(client: AsyncClient, tenant):
+    org_id, user_id = tenant.org["_id"], tenant.user["_id"]
+
+    for headers in ({"X-Org-ID": org_id, "X-User-ID": user_id},
+                    {"X-Org-ID": org_id.upper(), "X-User-ID": user_id.upper()}):
+        response = await client.get("/notes/", headers=headers)
+        assert response.status_code == 200
+    assert tenant_cache.get((org_id, user_id)) is not None
+    assert tenant_cache.get((org_id.upper(), user_id.upper())) is None
+
+    await client.post(f"/organizations/{org_id}/users/", json={
+        "email": "another@example.com", "full_name": "Another User"})
+    assert tenant_cache.get((org_id, user_id)) is None
+
+
+async def test_malformed_ids_are_not_found(client: AsyncClient, tenant):
+    org_id = tenant.org["_id"]
+
+    response = await client.get("/notes/", headers={
+        "X-Org-ID": org_id, "X-User-ID": "not-an-object-id"})
+
+    assert response.status_code == 404
+
+
+async def test_user_of_another_organization_is_rejected(client: AsyncClient, tenant):
+    user_id = tenant.user["_id"]
+    other = (await client.post("/organizations/",
+                               json={"name": "Other Org"})).json()
+
+    response = await client.get("/notes/", headers={
+        "X-Org-ID": other["_id"], "X-User-ID": user_id})
+
+    assert response.status_code == 403
+    assert response.json()["error_code"] == "invalid_org"
@@ -66,3 +66,21 @@ async def test_list_users(client: AsyncClient):
     assert response.status_code == 200
     assert len(data) == 2
     assert all("email" in user for user in data)
+
+
+async def test_same_email_allowed_in_different_organizations(
+        client: AsyncClient):
+    user_payload = {
+        "email": "shared@example.com",
+        "full_name": "Shared User",
+        "role": "reader"
+    }
+
+    for name in ("First Email Org", "Second Email Org"):
+        org_response = await client.post("/organizations/",
+                                         json={"name": name})
+        org_id = org_response.json()["_id"]
+
+        response = await client.post(f"/organizations/{org_id}/users/",
+                                     json=user_payload)
+        assert response.status_code == 201
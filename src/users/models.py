@@ -1,13 +1,13 @@
-from typing import Annotated
 from datetime import datetime, timezone
-from beanie import Document, Link, Indexed
+from beanie import Document, Link
 from pydantic import EmailStr, Field
+from pymongo import ASCENDING, IndexModel
 from src.organizations.models import Organization
 
 
 class User(Document):
 
-    email: Annotated[EmailStr, Indexed(unique=True)]
+    email: EmailStr
     full_name: str
     role: str = Field(default="reader", description="reader | writer | admin")
     org: Link[Organization]
@@ -17,4 +17,10 @@ class User(Document):
 
     class Settings:
         name = "users"
-        fetch_links = True
+        indexes = [
+            IndexModel(
+                [("org.$id", ASCENDING), ("email", ASCENDING)],
+                unique=True,
+                name="org_email_unique",
+            ),
+        ]
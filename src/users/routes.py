@@ -1,7 +1,12 @@
 from fastapi import APIRouter, status, Request
 from beanie import PydanticObjectId
-from src.users.schemas import UserCreateSchema, UserReadSchema
+from src.users.schemas import (
+    UserCreateSchema, UserReadSchema, user_list_adapter
+)
 from src.users.services import user_svc
+from src.organizations.versions import collection_etag
+from src.utils.etag import etag_matches, not_modified
+from src.utils.serialization import json_response
 
 user_router = APIRouter()
 
@@ -16,4 +21,10 @@ async def create_user(request: Request, org_id: PydanticObjectId,
 @user_router.get("/", response_model=list[UserReadSchema],
                  status_code=status.HTTP_200_OK)
 async def list_users(request: Request, org_id: PydanticObjectId):
-    return await user_svc.list_users(org_id)
+    etag = await collection_etag(org_id, "users")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    users = await user_svc.list_users(org_id)
+    return json_response(user_list_adapter, users,
+                         headers={"ETag": etag} if etag else None)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, TypeAdapter
 from bson import ObjectId
 
 from src.organizations.schemas import OrganizationMiniSchema
@@ -43,14 +43,23 @@ class UserReadSchema(BaseModel):
         org_doc = await base_svc.resolve_link(org_attr)
 
         if org_doc:
-            data["org"] = OrganizationMiniSchema(
-                id=str(org_doc.id),
-                name=org_doc.name,
-                description=org_doc.description
-            )
+            data["org"] = OrganizationMiniSchema.from_document(org_doc)
 
         return cls(**data)
 
+    @classmethod
+    def from_raw(cls, doc: dict, org: OrganizationMiniSchema):
+        """Build from a raw Mongo document and its already serialized
+        organization, without validation."""
+        return cls.model_construct(
+            id=str(doc["_id"]),
+            email=doc["email"],
+            full_name=doc["full_name"],
+            role=doc["role"],
+            created_at=doc["created_at"],
+            org=org,
+        )
+
 
 class UserMiniSchema(BaseModel):
     id: str = Field(alias="_id")
@@ -63,3 +72,17 @@ class UserMiniSchema(BaseModel):
         arbitrary_types_allowed=True,
         json_encoders={ObjectId: str},
     )
+
+    @classmethod
+    def from_document(cls, user):
+        return cls.model_construct(id=str(user.id), email=user.email,
+                                   full_name=user.full_name, role=user.role)
+
+    @classmethod
+    def from_snapshot(cls, user_id, snapshot: dict):
+        return cls.model_construct(id=str(user_id), email=snapshot["email"],
+                                   full_name=snapshot["full_name"],
+                                   role=snapshot["role"])
+
+
+user_list_adapter = TypeAdapter(list[UserReadSchema])
@@ -1,18 +1,28 @@
 from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 from src.users.models import User
 from src.users.schemas import UserCreateSchema, UserReadSchema
+from src.organizations.schemas import OrganizationMiniSchema
 from src.organizations.models import Organization
+from src.organizations.versions import bump_version
+from src.dependencies.tenant import invalidate_tenant_cache
+from src.utils.link_resolver import TenantScopedService
+from src.db.routing import session_options
+from src.db.tenancy import namespaces, to_db
 
 from src.middlewares.errors import OrganizationNotFound, UserAlreadyExists
 
 
-class UserService:
+class UserService(TenantScopedService):
+
+    document_model = User
 
     async def get_organization(self, org_id):
         org_id = PydanticObjectId(org_id)
-        org = await Organization.get(org_id)
+        org = await Organization.get(org_id, **session_options())
         if not org:
             raise OrganizationNotFound()
+        await namespaces.bind(org.id)
         return org
 
     async def create_user(self, org_id: PydanticObjectId,
@@ -20,24 +30,25 @@ class UserService:
 
         org = await self.get_organization(org_id)
 
-        existing = await User.find_one({
-            "email": data.email,
-            "org.$id": org.id
-        })
-        if existing:
+        user = User(id=PydanticObjectId(), **data.model_dump(), org=org)
+        try:
+            await self.collection(org).insert_one(to_db(user),
+                                                  **session_options())
+        except DuplicateKeyError:
             raise UserAlreadyExists()
 
-        user = User(**data.model_dump(), org=org)
-        await user.insert()
+        await bump_version(org.id, "users")
+        invalidate_tenant_cache(org_id=org.id)
         return await UserReadSchema.from_mongo(user)
 
-    async def list_users(self, org_id: PydanticObjectId) -> list[User]:
+    async def list_users(self,
+                         org_id: PydanticObjectId) -> list[UserReadSchema]:
         org = await self.get_organization(org_id)
 
-        users = await (User.find({"org.$id": org.id})
-                       .to_list())
+        users = await self.find_scoped(org).to_list(length=None)
 
-        return [await UserReadSchema.from_mongo(user) for user in users]
+        org_mini = OrganizationMiniSchema.from_document(org)
+        return [UserReadSchema.from_raw(user, org_mini) for user in users]
 
 
 user_svc = UserService()
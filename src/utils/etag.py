@@ -0,0 +1,18 @@
+from fastapi import Request, Response, status
+
+
+def etag_matches(request: Request, etag: str | None) -> bool:
+    """Whether the request's If-None-Match covers `etag` (weak
+    comparison, as RFC 9110 requires for If-None-Match)."""
+    header = request.headers.get("if-none-match")
+    if etag is None or header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag})
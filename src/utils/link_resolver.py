@@ -1,4 +1,18 @@
-from beanie import Link
+from beanie import Document, Link
+from bson import DBRef
+
+from src.db.routing import read_collection, session_options
+from src.db.tenancy import tenant_collection
+
+
+def link_id(ref):
+    """Return the referenced id of a link, raw DBRef or document without
+    fetching anything; plain ids are returned unchanged."""
+    if isinstance(ref, Link):
+        return ref.ref.id
+    if isinstance(ref, (DBRef, Document)):
+        return ref.id
+    return ref
 
 
 class BaseService:
@@ -6,3 +20,68 @@ class BaseService:
         if isinstance(link_or_doc, Link):
             return await link_or_doc.fetch()
         return link_or_doc
+
+
+class TenantScopedService(BaseService):
+    """Base for services over a collection whose documents link to an
+    organization: every query issued through it carries `org.$id`.
+
+    Results are raw documents; subclasses set `document_model`.
+    """
+
+    document_model: type[Document]
+
+    def tenant_filter(self, org, query: dict | None = None) -> dict:
+        return {**(query or {}), "org.$id": link_id(org)}
+
+    def collection(self, org):
+        """The collection holding the organization's documents."""
+        return tenant_collection(self.document_model, link_id(org))
+
+    def find_scoped(self, org, query: dict | None = None, projection=None):
+        return read_collection(self.document_model, link_id(org)).find(
+            self.tenant_filter(org, query), projection, **session_options())
+
+    async def find_one_scoped(self, org, query: dict,
+                              projection=None) -> dict | None:
+        return await read_collection(self.document_model, link_id(org)).find_one(
+            self.tenant_filter(org, query), projection, **session_options())
+
+    async def delete_one_scoped(self, org, query: dict) -> int:
+        result = await self.collection(org).delete_one(
+            self.tenant_filter(org, query), **session_options())
+        return result.deleted_count
+
+
+class IdentityMap:
+    """Per-request map of already loaded documents, keyed by model and id.
+
+    It is seeded with the tenant's organization, whose namespace users
+    and notes are loaded from, and any other documents the endpoint
+    already holds; the remaining references are batch-loaded with one
+    `$in` query per model instead of fetching every link on its own.
+    """
+
+    def __init__(self, org: Document, *docs: Document):
+        self.org_id = org.id
+        self._docs: dict = {}
+        for doc in (org, *docs):
+            self.add(doc)
+
+    def add(self, doc: Document) -> None:
+        self._docs[(type(doc), doc.id)] = doc
+
+    def get(self, model: type[Document], link_or_doc):
+        return self._docs.get((model, link_id(link_or_doc)))
+
+    async def load(self, model: type[Document], links) -> None:
+        missing = {link_id(link) for link in links}
+        missing = [i for i in missing if (model, i) not in self._docs]
+        if not missing:
+            return
+
+        found = await (read_collection(model, self.org_id)
+                       .find({"_id": {"$in": missing}}, **session_options())
+                       .to_list(length=None))
+        for doc in found:
+            self.add(model.model_validate(doc))
@@ -0,0 +1,34 @@
+import base64
+import binascii
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from src.middlewares.errors import InvalidCursor
+
+
+def encode_cursor(created_at: datetime, doc_id: ObjectId) -> str:
+    """Encode the sort key of the last item of a page as an opaque token."""
+    raw = f"{created_at.isoformat()}|{doc_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded).decode()
+        created_at, doc_id = raw.split("|")
+        return datetime.fromisoformat(created_at), ObjectId(doc_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidId):
+        raise InvalidCursor()
+
+
+def keyset_filter(created_at: datetime, doc_id: ObjectId) -> dict:
+    """Filter selecting the items that sort after the cursor position
+    for a `(created_at desc, _id desc)` ordering."""
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+        ]
+    }
@@ -0,0 +1,18 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(adapter: TypeAdapter, items, status_code: int = 200,
+                  headers: dict | None = None) -> Response:
+    """Serialize already built schemas straight to JSON bytes.
+
+    Returning a `Response` makes FastAPI skip re-validating the payload
+    against the route's `response_model`, which stays declared for the
+    OpenAPI docs only.
+    """
+    return Response(
+        content=adapter.dump_json(items, by_alias=True),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
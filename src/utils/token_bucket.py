@@ -0,0 +1,31 @@
+class TokenBucket:
+    """Classic token bucket: holds up to `capacity` tokens and refills at
+    `rate` tokens per second. Time is passed in by the caller."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def consume(self, now: float, amount: float = 1.0) -> bool:
+        self.refill(now)
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def retry_after(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens are available."""
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def reset_after(self) -> float:
+        """Seconds until the bucket is full again."""
+        return max(0.0, (self.capacity - self.tokens) / self.rate)